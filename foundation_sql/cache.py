@@ -1,24 +1,55 @@
+import functools
 import os
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Templates kept in memory per cache; least recently used ones are dropped first
+MAX_MEMORY_TEMPLATES = 1024
 
 
 class SQLTemplateCache:
     """
     Simple file-based cache using file names as keys.
 
+    Templates read or written in this process are also kept in memory along
+    with the file's modification time, so repeated lookups only need a stat
+    call. A changed mtime (e.g. the file was edited) triggers a fresh read.
+    At most max_size templates are held; the least recently used go first.
+
     Attributes:
         cache_dir (str): Directory to store cached templates
     """
 
-    def __init__(self, cache_dir: str):
+    def __init__(self, cache_dir: str, max_size: int = MAX_MEMORY_TEMPLATES):
         """
         Initialize the SQL template cache.
 
         Args:
             cache_dir (str): Directory to store cached templates
+            max_size (int): Maximum number of templates kept in memory
         """
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
+        self.max_size = max_size
+        self._mem: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, cache_dir: str) -> "SQLTemplateCache":
+        """
+        Get the cache for a directory, shared by every caller in this process.
+
+        Decorators using the same directory then share the in-memory templates
+        instead of each reading the files again.
+
+        Args:
+            cache_dir (str): Directory to store cached templates
+
+        Returns:
+            SQLTemplateCache for the directory
+        """
+        return _shared_cache(cls, os.path.abspath(cache_dir))
 
     def _get_cache_path(self, key: str) -> str:
         """
@@ -41,8 +72,23 @@ class SQLTemplateCache:
             template (str): SQL template to cache
         """
         cache_file = self._get_cache_path(key)
-        with open(cache_file, "w") as f:
-            f.write(template)
+        # Write to a temporary file and swap it in, so readers never see a
+        # partially written template
+        tmp_path, fd = _create_temp_file(cache_file)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(template)
+            # Keep the permissions of the file being replaced
+            try:
+                os.chmod(tmp_path, os.stat(cache_file).st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._remember(key, os.stat(cache_file).st_mtime_ns, template)
 
     def get(self, key: str) -> Optional[str]:
         """
@@ -55,10 +101,52 @@ class SQLTemplateCache:
             Optional[str]: Cached SQL template or None if not found
         """
         cache_file = self._get_cache_path(key)
-        if os.path.exists(cache_file):
-            with open(cache_file, "r") as f:
-                return f.read()
-        return None
+        try:
+            mtime = os.stat(cache_file).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._mem.pop(key, None)
+            return None
+
+        with self._lock:
+            cached = self._mem.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._mem.move_to_end(key)
+                return cached[1]
+
+        with open(cache_file, "r") as f:
+            template = f.read()
+        self._remember(key, mtime, template)
+        return template
+
+    def _remember(self, key: str, mtime: int, template: str) -> None:
+        """Keep a template in memory, dropping the least recently used beyond max_size."""
+        with self._lock:
+            self._mem[key] = (mtime, template)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_size:
+                self._mem.popitem(last=False)
+
+    def preload(self) -> int:
+        """
+        Read every template in the cache directory into memory in one pass,
+        e.g. at startup, so first calls of decorated functions skip the read.
+
+        Returns:
+            int: Number of templates loaded
+        """
+        loaded = {}
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                # Skips the temporary files set() writes before swapping them in
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                with open(entry.path, "r") as f:
+                    loaded[entry.name] = (mtime, f.read())
+        for key, (mtime, template) in loaded.items():
+            self._remember(key, mtime, template)
+        return len(loaded)
 
     def exists(self, key: str) -> bool:
         """
@@ -81,6 +169,12 @@ class SQLTemplateCache:
             key (Optional[str]): Specific key to clear.
                                  If None, clears entire cache.
         """
+        with self._lock:
+            if key:
+                self._mem.pop(key, None)
+            else:
+                self._mem.clear()
+
         if key:
             cache_file = self._get_cache_path(key)
             if os.path.exists(cache_file):
@@ -90,3 +184,28 @@ class SQLTemplateCache:
                 file_path = os.path.join(self.cache_dir, filename)
                 if os.path.isfile(file_path):
                     os.remove(file_path)
+
+
+def _create_temp_file(path: str) -> Tuple[str, int]:
+    """
+    Create a new, hidden file next to ``path`` and open it for writing.
+
+    Unlike mkstemp(), which always uses mode 0600, the file gets the mode
+    open(..., "w") would give it, i.e. 0666 masked by the process umask.
+
+    Returns:
+        Tuple of the file's path and its file descriptor
+    """
+    directory, name = os.path.split(path)
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}")
+        try:
+            fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            continue
+        return tmp_path, fd
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_cache(cls: type, cache_dir: str) -> SQLTemplateCache:
+    return cls(cache_dir)
@@ -1,19 +1,278 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
 import logging
-import re  # Add missing import
+import os
+import re
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import asyncpg
+import jinja2
 from jinja2sql import Jinja2SQL
 from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import StaticPool
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON for the tojson filter
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of distinct compiled templates kept per parameter style
+TEMPLATE_CACHE_SIZE = 2048
+
+# Rendered statements are stable per template, so their TextClause can be reused
+_text = functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(text)
+
+# Explicit ``{{ value | tojson }}`` filters; values are bound as parameters instead
+_TOJSON_RE = re.compile(r"\{\{\s*([^}]+?)\s*\|\s*tojson\s*\}\}")
+
+# DDL keywords marking statements executed without bound parameters
+_SCHEMA_KW_RE = re.compile(r"\b(CREATE|DROP|ALTER|TRUNCATE)\b", re.I)
+
+# PostgreSQL statements that cannot run inside a transaction block. A script
+# sent as one simple query runs in an implicit transaction, so scripts with
+# any of these are executed statement by statement instead
+_NO_TRANSACTION_RE = re.compile(
+    r"\b(CONCURRENTLY|VACUUM|(CREATE|DROP)\s+(DATABASE|TABLESPACE)|ALTER\s+SYSTEM"
+    r"|REINDEX\s+(SYSTEM|DATABASE))\b",
+    re.I,
+)
+
+# PostgreSQL dollar-quote delimiters: $$ or $tag$ (not $1 placeholders)
+_DOLLAR_QUOTE_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+
+
+class NotStreamableError(ValueError):
+    """Raised by stream_sql() for templates that are not a single SELECT."""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_jinja2sql(param_style: str) -> Jinja2SQL:
+    """Shared Jinja2SQL instance (and Jinja environment) for a parameter style.
+
+    Jinja2SQL keeps per-render state in a ContextVar, so one instance can safely
+    serve every adapter using the same parameter style.
+    """
+    env = jinja2.Environment(auto_reload=False)
+    # Available to every template unless the render context provides its own
+    env.globals["now"] = datetime.now
+    if orjson is not None:
+        # Used by tojson filters that are not bound as parameters, e.g. inside
+        # {% %} blocks; Jinja still applies its HTML-safe escaping on top
+        env.policies["json.dumps_function"] = _orjson_dumps
+    bytecode_dir = os.getenv("SQL_TEMPLATE_BYTECODE_DIR")
+    if bytecode_dir:
+        # Compiled templates are kept on disk and reused by later processes
+        os.makedirs(bytecode_dir, exist_ok=True)
+        env.bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_dir)
+    return Jinja2SQL(env, param_style=param_style)
+
+
+def _orjson_dumps(obj: Any, sort_keys: bool = False, **kwargs: Any) -> str:
+    """json.dumps() stand-in for Jinja's tojson filter, encoding with orjson.
+
+    Output is compact and keeps non-ASCII characters unescaped. Calls with
+    further options (e.g. ``tojson(indent=2)``) and values orjson rejects
+    (e.g. integers wider than 64 bits) are left to json.dumps().
+    """
+    if kwargs:
+        return json.dumps(obj, sort_keys=sort_keys, **kwargs)
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        return orjson.dumps(obj, option=option).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(obj, sort_keys=sort_keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _template_compiler(j2sql: Jinja2SQL) -> Callable[[str], jinja2.Template]:
+    """Build a memoized compiler for templates rendered through ``j2sql``.
+
+    Templates are normalized (explicit ``tojson`` filters are removed so values
+    are bound as parameters) and compiled once per unique template string. The
+    compiled template can then be rendered repeatedly via ``j2sql.from_file``.
+    Compilers are shared per Jinja2SQL instance.
+
+    When the environment has a bytecode cache (see SQL_TEMPLATE_BYTECODE_DIR),
+    the Python code compiled from a template is stored there, so other
+    processes load it instead of lexing, parsing and compiling the template.
+    """
+    env = j2sql.env
+
+    @functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def compile_template(template: str) -> jinja2.Template:
+        source = _TOJSON_RE.sub(r"{{ \1 }}", template)
+        bytecode_cache = env.bytecode_cache
+        if bytecode_cache is None:
+            return env.from_string(source)
+        # Jinja only consults the cache for loader templates; string templates
+        # are keyed by their source instead of a template name
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        bucket = bytecode_cache.get_bucket(
+            env, f"{j2sql.param_style}:{digest}", None, source
+        )
+        if bucket.code is None:
+            bucket.code = env.compile(source)
+            bytecode_cache.set_bucket(bucket)
+        return env.template_class.from_code(
+            env, bucket.code, env.make_globals(None), None
+        )
+
+    return compile_template
+
+
+def _engine_options(dsn: str, **overrides: Any) -> Dict[str, Any]:
+    """Dialect specific create_engine() options for the given DSN.
+
+    Pool settings default from the DB_POOL_* environment variables; explicit
+    ``overrides`` take precedence over everything.
+    """
+    url = make_url(dsn)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        # SQLite uses its own single-connection pools; sizing args are invalid there
+        if url.database in (None, "", ":memory:") or url.query.get("mode") == "memory":
+            # Share the one in-memory database across threads; this also keeps
+            # a named in-memory database (file:name?mode=memory) alive
+            options.update(
+                poolclass=StaticPool, connect_args={"check_same_thread": False}
+            )
+        options.update(overrides)
+        return options
+
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", 10)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        # Disable behind PgBouncer, where the extra round-trip is wasted
+        pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower()
+        in ("1", "true", "yes"),
+    )
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        # executemany() of text() statements goes through psycopg2's
+        # execute_batch, a few round-trips per batch instead of one per row
+        options["executemany_mode"] = "values_plus_batch"
+    options.update(overrides)
+    return options
+
+
+def _pool_options(**overrides: Any) -> Dict[str, Any]:
+    """asyncpg.create_pool() options; explicit ``overrides`` take precedence.
+
+    asyncpg prepares parameterized statements and caches them per connection, so
+    repeated queries skip server-side parse/plan. Set DB_STATEMENT_CACHE_SIZE=0
+    behind PgBouncer in transaction mode, where prepared statements are not kept.
+    """
+    options: Dict[str, Any] = {
+        "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256)),
+        # Keep prepared statements for the connection lifetime instead of 5 minutes
+        "max_cached_statement_lifetime": 0,
+    }
+    options.update(overrides)
+    return options
+
+
+def install_uvloop() -> bool:
+    """Make uvloop the asyncio event loop implementation, if it is installed.
+
+    Call once at application startup, before the event loop is created; asyncpg
+    network I/O is noticeably cheaper on uvloop than on the default loop.
+
+    Returns:
+        Whether uvloop was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def _is_static(template: str) -> bool:
+    """Whether a template has no Jinja markup and renders to itself."""
+    return "{{" not in template and "{%" not in template and "{#" not in template
+
+
+def _is_select(statement: str) -> bool:
+    """Whether a single statement is a read-only SELECT."""
+    return statement[:6].upper() == "SELECT"
+
+
+def _split_statements(sql: str) -> List[str]:
+    """Split SQL text into statements on top-level semicolons.
+
+    Semicolons inside quoted literals/identifiers, PostgreSQL dollar-quoted
+    bodies and comments do not split.
+    The common single-statement case returns without scanning character by
+    character.
+    """
+    stripped = sql.strip().rstrip(";").rstrip()
+    if ";" not in stripped:
+        return [stripped] if stripped else []
+
+    statements = []
+    start = 0
+    quote = None
+    i = 0
+    n = len(stripped)
+    while i < n:
+        ch = stripped[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch == "'" or ch == '"':
+            quote = ch
+        elif ch == "-" and stripped.startswith("--", i):
+            end = stripped.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        elif ch == "/" and stripped.startswith("/*", i):
+            end = stripped.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif ch == "$":
+            match = _DOLLAR_QUOTE_RE.match(stripped, i)
+            if match:
+                tag = match.group()
+                end = stripped.find(tag, match.end())
+                i = n if end == -1 else end + len(tag)
+                continue
+        elif ch == ";":
+            statement = stripped[start:i].strip()
+            if statement:
+                statements.append(statement)
+            start = i + 1
+        i += 1
+
+    statement = stripped[start:].strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
 
 class EngineAdapter(ABC):
     """Abstract adapter for DB engines (sync and async)."""
@@ -49,67 +308,192 @@ class EngineAdapter(ABC):
 class SQLAlchemyAdapter(EngineAdapter):
     """Synchronous adapter backed by SQLAlchemy engine."""
 
-    def __init__(self, dsn: str) -> None:
+    def __init__(self, dsn: str, **engine_options: Any) -> None:
+        """
+        Args:
+            dsn: SQLAlchemy database URL
+            **engine_options: create_engine() keyword arguments overriding the
+                              defaults (e.g. pool_size, pool_pre_ping)
+        """
         self.dsn = dsn
-        self.engine: Engine = create_engine(self.dsn)
+        self.engine: Engine = create_engine(
+            self.dsn, **_engine_options(self.dsn, **engine_options)
+        )
         # Use a valid Jinja2SQL param style compatible with SQLAlchemy bound params
         # "named" produces :name parameters which SQLAlchemy understands via text() bindings
-        self.j2sql = Jinja2SQL(param_style="named")
+        self.j2sql = _get_jinja2sql("named")
+        self._compile = _template_compiler(self.j2sql)
+        # Connection bound by transaction() for the current thread/task
+        self._connection: ContextVar[Optional[Connection]] = ContextVar(
+            f"connection_{id(self)}", default=None
+        )
 
     def init_schema(self, schema_sql: str) -> None:
+        dialect = self.engine.dialect
+        dbapi_error = dialect.loaded_dbapi.Error
         with self.engine.begin() as conn:
             try:
-                for statement in schema_sql.split(";"):
-                    if statement.strip():
+                if dialect.name == "sqlite" and dialect.driver == "pysqlite":
+                    # One native call runs the whole script
+                    conn.connection.driver_connection.executescript(schema_sql)
+                elif dialect.name == "postgresql" and not _NO_TRANSACTION_RE.search(
+                    schema_sql
+                ):
+                    # PostgreSQL accepts multiple statements in a single round-trip
+                    conn.exec_driver_sql(schema_sql)
+                else:
+                    for statement in _split_statements(schema_sql):
                         conn.execute(text(statement))
-            except SQLAlchemyError as e:
+            except (SQLAlchemyError, dbapi_error) as e:
                 raise RuntimeError(f"Failed to initialize schema: {str(e)}") from e
 
-    def run_sql(self, template: str, data: Dict[str, Any]) -> Any:
-        # ensure now is available
-        if "now" not in data:
-            data["now"] = datetime.now
-
+    def _render(self, template: str, data: Dict[str, Any]) -> Tuple[str, Any]:
+        if _is_static(template):
+            # Plain SQL: nothing to render or bind
+            return template, {}
         try:
-            # Normalize templates: remove explicit tojson filters to allow binding
-            normalized = re.sub(
-                r"\{\{\s*([^}]+?)\s*\|\s*tojson\s*\}\}", r"{{ \1 }}", template
-            )
-            query, params = self.j2sql.from_string(normalized, context=data)
+            return self.j2sql.from_file(self._compile(template), context=data)
         except Exception as e:
             raise ValueError(
                 f"Failed to render SQL. Likely SQL template & Parameter mismatch: {str(e)}"
             ) from e
 
-        with self.engine.connect() as conn:
-            with conn.begin():
-                try:
-                    statements = [
-                        stmt.strip() for stmt in query.split(";") if stmt.strip()
-                    ]
-                    total_rows = 0
-                    last_result = None
-
-                    logger.debug(f"Executing statements: {len(statements)}")
-                    for statement in statements:
-                        logger.debug(f"Executing statement: {statement} {params}")
-                        result = conn.execute(text(statement), params)
-                        total_rows += result.rowcount
-                        if result.returns_rows:
-                            last_result = result
-
-                    if last_result and last_result.returns_rows:
-                        rows = [dict(row._mapping) for row in last_result]
-                        logger.debug(f"Returning rows: {rows}")
-                        # Return the same shape as Database currently does: a QueryResult-like object
-                        # The Database facade will wrap rows if needed; here we just return rows
-                        return rows
-
-                    return total_rows
-                except SQLAlchemyError as e:
-                    raise RuntimeError(
-                        f"Failed to execute SQL: {str(e)}\nRendered SQL: {query}"
-                    ) from e
+    def run_sql(self, template: str, data: Dict[str, Any]) -> Any:
+        query, params = self._render(template, data)
+        statements = _split_statements(query)
+        conn = self._connection.get()
+        if conn is not None:
+            # Inside transaction(): share the caller's connection
+            return self._execute_statements(conn, statements, params, query)
+
+        if all(_is_select(statement) for statement in statements):
+            # Read-only queries skip the BEGIN/COMMIT round-trips
+            with self.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as conn:
+                return self._execute_statements(conn, statements, params, query)
+
+        with self.engine.begin() as conn:
+            return self._execute_statements(conn, statements, params, query)
+
+    def run_many(self, template: str, data: Iterable[Dict[str, Any]]) -> int:
+        """Run a single-statement template once per context, batched with executemany.
+
+        Contexts rendering to the same SQL (the usual case for an INSERT template)
+        are sent as one executemany batch; all batches share one transaction.
+
+        Returns:
+            Total number of rows affected, as reported by the driver
+        """
+        batches: List[Tuple[str, List[Any]]] = []
+        for context in data:
+            query, params = self._render(template, context)
+            statements = _split_statements(query)
+            if len(statements) != 1:
+                raise ValueError("run_many() only supports a single statement")
+            if batches and batches[-1][0] == statements[0]:
+                batches[-1][1].append(params)
+            else:
+                batches.append((statements[0], [params]))
+        if not batches:
+            return 0
+
+        shared = self._connection.get()
+        with contextlib.ExitStack() as stack:
+            conn = (
+                shared
+                if shared is not None
+                else stack.enter_context(self.engine.begin())
+            )
+            try:
+                return sum(
+                    conn.execute(_text(statement), params).rowcount
+                    for statement, params in batches
+                )
+            except SQLAlchemyError as e:
+                raise RuntimeError(
+                    f"Failed to execute SQL: {str(e)}\nRendered SQL: {batches[0][0]}"
+                ) from e
+
+    def stream_sql(
+        self, template: str, data: Dict[str, Any], yield_per: int = 1000
+    ) -> Tuple[Iterator[Dict[str, Any]], Callable[[], None]]:
+        """Run a single SELECT with a server-side cursor, fetching yield_per rows at a time.
+
+        Returns:
+            Tuple of the row iterator and a callback that releases its connection
+        """
+        query, params = self._render(template, data)
+        statements = _split_statements(query)
+        if len(statements) != 1 or not _is_select(statements[0]):
+            raise NotStreamableError(
+                "stream_sql() only supports a single SELECT statement"
+            )
+
+        shared = self._connection.get()
+        conn = shared if shared is not None else self.engine.connect()
+        release = (lambda: None) if shared is not None else conn.close
+        try:
+            result = conn.execution_options(
+                stream_results=True, max_row_buffer=yield_per
+            ).execute(_text(statements[0]), params)
+        except SQLAlchemyError as e:
+            release()
+            raise RuntimeError(
+                f"Failed to execute SQL: {str(e)}\nRendered SQL: {query}"
+            ) from e
+        return map(dict, result.mappings().yield_per(yield_per)), release
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """Run every run_sql() call in the block on one connection and transaction."""
+        with self.engine.begin() as conn:
+            token = self._connection.set(conn)
+            try:
+                yield conn
+            finally:
+                self._connection.reset(token)
+
+    def _execute_statements(
+        self, conn: Connection, statements: List[str], params: Any, query: str
+    ) -> Any:
+        try:
+            if (
+                not params
+                and len(statements) > 1
+                and conn.dialect.name == "postgresql"
+                and all(_SCHEMA_KW_RE.match(s) for s in statements)
+                and not _NO_TRANSACTION_RE.search(query)
+            ):
+                # A parameterless DDL script runs in one round-trip, as in
+                # init_schema; DDL reports no affected rows
+                conn.exec_driver_sql(query)
+                return 0
+
+            total_rows = 0
+            last_result = None
+
+            logger.debug(f"Executing statements: {len(statements)}")
+            for statement in statements:
+                logger.debug(f"Executing statement: {statement} {params}")
+                result = conn.execute(_text(statement), params)
+                total_rows += result.rowcount
+                if result.returns_rows:
+                    last_result = result
+
+            if last_result and last_result.returns_rows:
+                # Plain dicts, as QueryResult documents: mutable and JSON-serializable
+                rows = [dict(row) for row in last_result.mappings()]
+                logger.debug("Returning %d rows", len(rows))
+                # Return the same shape as Database currently does: a QueryResult-like object
+                # The Database facade will wrap rows if needed; here we just return rows
+                return rows
+
+            return total_rows
+        except SQLAlchemyError as e:
+            raise RuntimeError(
+                f"Failed to execute SQL: {str(e)}\nRendered SQL: {query}"
+            ) from e
 
     def close(self) -> None:
         try:
@@ -121,15 +505,25 @@ class SQLAlchemyAdapter(EngineAdapter):
 class AsyncpgAdapter(EngineAdapter):
     """Adapter for asyncpg (async PostgreSQL driver)."""
 
-    def __init__(self, dsn: str) -> None:
+    def __init__(self, dsn: str, **pool_options: Any) -> None:
+        """
+        Args:
+            dsn: PostgreSQL connection string
+            **pool_options: asyncpg.create_pool() keyword arguments overriding the
+                            defaults (e.g. statement_cache_size, max_size)
+        """
         self.dsn = dsn
         self.pool: Optional[asyncpg.Pool] = None
+        self._pool_options = _pool_options(**pool_options)
         # jinja2sql will render SQL & parameters in asyncpg style ($1, $2, ...)
-        self.j2sql = Jinja2SQL(param_style="asyncpg")
+        self.j2sql = _get_jinja2sql("asyncpg")
+        self._compile = _template_compiler(self.j2sql)
+        # Templates already compiled for this adapter, rendered without a thread hop
+        self._compiled: Dict[str, jinja2.Template] = {}
 
     async def init_pool_async(self) -> None:
         if self.pool is None:
-            self.pool = await asyncpg.create_pool(self.dsn)
+            self.pool = await asyncpg.create_pool(self.dsn, **self._pool_options)
 
     async def close_async(self) -> None:
         if self.pool is not None:
@@ -139,9 +533,14 @@ class AsyncpgAdapter(EngineAdapter):
     async def init_schema_async(self, schema_sql: str) -> None:
         await self.init_pool_async()
         assert self.pool is not None
+        if _NO_TRANSACTION_RE.search(schema_sql):
+            statements = _split_statements(schema_sql)
+        else:
+            # Without arguments asyncpg uses the simple query protocol, which runs
+            # every statement of the script, in order, in a single round-trip
+            statements = [schema_sql]
         async with self.pool.acquire() as conn:
-            # Execute statements sequentially to ensure order
-            for statement in [s.strip() for s in schema_sql.split(";") if s.strip()]:
+            for statement in statements:
                 try:
                     logger.debug(f"Executing schema statement: {statement}")
                     await conn.execute(statement)
@@ -151,50 +550,104 @@ class AsyncpgAdapter(EngineAdapter):
                         f"Failed to execute schema statement: {str(e)}"
                     ) from e
 
-    async def run_sql_async(self, template: str, data: Dict[str, Any]) -> Any:
+    async def _render_async(
+        self, template: str, data: Dict[str, Any]
+    ) -> Tuple[str, List[Any]]:
+        try:
+            compiled = self._compiled.get(template)
+            if compiled is None:
+                # Compiling is the CPU-heavy step; keep it off the event loop
+                compiled = await asyncio.to_thread(self._compile, template)
+                if len(self._compiled) >= TEMPLATE_CACHE_SIZE:
+                    self._compiled.clear()
+                self._compiled[template] = compiled
+            # jinja2sql generates SQL with $1, $2... placeholders and params in correct order
+            query, params_list = self.j2sql.from_file(compiled, context=data)
+
+            # Debug: log parameter types
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Rendered query: {query}")
+                logger.debug(f"Parameter values: {params_list}")
+                logger.debug(
+                    f"Parameter types: {[(type(p).__name__, p) for p in params_list]}"
+                )
+            return query, params_list
+
+        except Exception as e:
+            raise ValueError(
+                f"Failed to render SQL. Likely SQL template & Parameter mismatch: {str(e)}"
+            ) from e
+
+    async def run_many_async(
+        self, template: str, data: Iterable[Dict[str, Any]]
+    ) -> int:
+        """Run a single-statement template once per context, batched with executemany.
+
+        Contexts rendering to the same SQL are sent as one executemany batch,
+        prepared once and pipelined; all batches share one transaction.
+
+        Returns:
+            Number of executions; asyncpg does not report rows affected by executemany
+        """
+        batches: List[Tuple[str, List[Any]]] = []
+        for context in data:
+            query, params = await self._render_async(template, context)
+            statements = _split_statements(query)
+            if len(statements) != 1:
+                raise ValueError("run_many_async() only supports a single statement")
+            if batches and batches[-1][0] == statements[0]:
+                batches[-1][1].append(params)
+            else:
+                batches.append((statements[0], [params]))
+        if not batches:
+            return 0
+
         await self.init_pool_async()
         assert self.pool is not None
+        async with self.pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    for statement, params in batches:
+                        await conn.executemany(statement, params)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to execute SQL: {str(e)}\nRendered SQL: {batches[0][0]}"
+                ) from e
+        return sum(len(params) for _, params in batches)
 
-        if "now" not in data:
-            data["now"] = datetime.now
+    async def run_sql_async(self, template: str, data: Dict[str, Any]) -> Any:
+        await self.init_pool_async()
+        assert self.pool is not None
 
         # Special handling for templates without parameters
-        if "{{" not in template:
+        if _is_static(template):
             # No template variables, execute directly
             async with self.pool.acquire() as conn:
-                is_select = template.strip().lower().startswith("select")
-                if is_select:
+                if _is_select(template.lstrip()):
                     records = await conn.fetch(template)
-                    return [dict(r) for r in records]
+                    return list(map(dict, records))
                 else:
                     status = await conn.execute(template)
                     return _parse_rowcount(status)
 
-        try:
-            # Add the same template normalization as SQLAlchemyAdapter
-            # Normalize templates: remove explicit tojson filters to allow binding
-            normalized = re.sub(
-                r"\{\{\s*([^}]+?)\s*\|\s*tojson\s*\}\}", r"{{ \1 }}", template
-            )
-            # jinja2sql generates SQL with $1, $2... placeholders and params in correct order
-            query, params_list = self.j2sql.from_string(normalized, context=data)
-
-            # Debug: log parameter types
-            logger.debug(f"Rendered query: {query}")
-            logger.debug(f"Parameter values: {params_list}")
-            logger.debug(
-                f"Parameter types: {[(type(p).__name__, p) for p in params_list]}"
-            )
-
-        except Exception as e:
-            raise ValueError(
-                f"Failed to render SQL. Likely SQL template & Parameter mismatch: {str(e)}"
-            ) from e
+        query, params_list = await self._render_async(template, data)
 
         async with self.pool.acquire() as conn:
             try:
                 # Handle multiple statements like SQLAlchemyAdapter
-                statements = [stmt.strip() for stmt in query.split(";") if stmt.strip()]
+                statements = _split_statements(query)
+                if (
+                    not params_list
+                    and len(statements) > 1
+                    and all(_SCHEMA_KW_RE.match(s) for s in statements)
+                    and not _NO_TRANSACTION_RE.search(query)
+                ):
+                    # A parameterless DDL script runs in one round-trip over the
+                    # simple query protocol; DDL reports no affected rows
+                    logger.debug("Executing schema script")
+                    await conn.execute(query)
+                    return 0
+
                 total_rows = 0
                 last_result = None
 
@@ -202,20 +655,13 @@ class AsyncpgAdapter(EngineAdapter):
                 for i, statement in enumerate(statements):
                     logger.debug(f"Statement {i+1}: {statement}")
 
-                    is_select = statement.strip().lower().startswith("select")
-
-                    if is_select:
+                    if _is_select(statement):
                         last_result = await conn.fetch(statement, *params_list)
                         total_rows += len(last_result)
                         logger.debug(f"SELECT returned {len(last_result)} rows")
                     else:
                         # Check if this is a schema operation or data operation
-                        is_schema_op = any(
-                            keyword in statement.upper()
-                            for keyword in ["CREATE", "DROP", "ALTER", "TRUNCATE"]
-                        )
-
-                        if is_schema_op:
+                        if _SCHEMA_KW_RE.search(statement) is not None:
                             # Schema operations typically don't use parameters
                             logger.debug(
                                 "Executing as schema operation (no parameters)"
@@ -234,7 +680,8 @@ class AsyncpgAdapter(EngineAdapter):
 
                 # Return results similar to SQLAlchemyAdapter
                 if last_result is not None:
-                    rows = [dict(r) for r in last_result]
+                    # Same shape as SQLAlchemyAdapter: a list of plain dicts
+                    rows = list(map(dict, last_result))
                     logger.debug(f"Returning {len(rows)} rows")
                     return rows
 
@@ -251,6 +698,25 @@ class AsyncpgAdapter(EngineAdapter):
                 logger.error(error_msg)
                 raise RuntimeError(error_msg) from e
 
+    async def bulk_insert_async(
+        self, table: str, columns: List[str], rows: Iterable[Any]
+    ) -> int:
+        """Load rows into a table with COPY, in asyncpg's binary format.
+
+        Returns:
+            Number of rows copied
+        """
+        await self.init_pool_async()
+        assert self.pool is not None
+        async with self.pool.acquire() as conn:
+            try:
+                status = await conn.copy_records_to_table(
+                    table, records=rows, columns=columns
+                )
+            except Exception as e:
+                raise RuntimeError(f"Database execution error: {str(e)}") from e
+        return _parse_rowcount(status)
+
     # Sync methods are not supported for asyncpg adapter
     def init_schema(
         self, schema_sql: str
@@ -1,7 +1,17 @@
+import functools
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Markdown code fences (```sql ... ```) that models wrap generated SQL in
+_FENCE_RE = re.compile(r"^```sql\s*|^```\s*|```\s*$", re.MULTILINE)
 
 
 class SQLGenerator:
@@ -16,7 +26,13 @@ class SQLGenerator:
     """
 
     def __init__(
-        self, api_key: str, base_url: str, model: str = "llama-3.3-70b-versatile"
+        self,
+        api_key: str,
+        base_url: str,
+        model: str = "llama-3.3-70b-versatile",
+        timeout: Optional[float] = None,
+        max_retries: int = 2,
+        prompt_cache_size: int = 0,
     ):
         """
         Initialize the SQL generator.
@@ -24,36 +40,133 @@ class SQLGenerator:
         Args:
             api_key (str): API key for the LLM service
             base_url (str): Base URL for the LLM service
+            timeout (Optional[float]): Seconds to wait for one LLM request before
+                                       abandoning it. Defaults to the client's.
+            max_retries (int): Retries after a timed out or failed request
+            prompt_cache_size (int): Number of generated templates to remember by
+                                     exact prompt, so a repeated prompt skips the
+                                     LLM call. 0 disables the cache.
         """
         # Setup logging
         self.logger = logging.getLogger(__name__)
         self.model = model
         self.api_key = api_key
         self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.prompt_cache_size = prompt_cache_size
+        # sha256(prompt) -> template, least recently used first
+        self._prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._prompt_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def shared(cls, *args: Any, **kwargs: Any) -> "SQLGenerator":
+        """
+        Get a generator shared by every caller passing the same settings.
+
+        Sharing it shares the LLM client, so its HTTP connections (and TLS
+        sessions) stay open across decorators, along with the prompt cache.
+
+        Args:
+            *args, **kwargs: Constructor arguments; they must be hashable
 
-    @property
-    def client(self):
-        return OpenAI(api_key=self.api_key, base_url=self.base_url)
+        Returns:
+            SQLGenerator for the settings
+        """
+        return _shared_generator(cls, args, tuple(sorted(kwargs.items())))
+
+    @functools.cached_property
+    def client(self) -> "OpenAI":
+        # Created on first use and reused, keeping its HTTP connection pool warm.
+        # openai is imported here: it is slow to import and only needed when a
+        # template actually has to be generated
+        from openai import OpenAI
 
-    def generate_sql(self, prompt: str) -> str:
+        options: Dict[str, Any] = {"max_retries": self.max_retries}
+        if self.timeout is not None:
+            # A slow request is cut off and retried rather than awaited in full
+            options["timeout"] = self.timeout
+        return OpenAI(api_key=self.api_key, base_url=self.base_url, **options)
+
+    def generate_sql(
+        self, prompt: Union[str, List[Dict[str, str]]], use_cache: bool = True
+    ) -> str:
         """
         Generate an SQL template based on the provided prompt.
 
         Args:
-            prompt (str): Detailed prompt for SQL generation
+            prompt (Union[str, List[Dict[str, str]]]): Detailed prompt for SQL
+                generation, either as a single system message or as chat messages
+            use_cache (bool): Whether the prompt cache may answer this prompt.
+                              Pass False when a fresh answer is needed, e.g. to
+                              repair a template that failed.
 
         Returns:
             str: Generated SQL template
         """
+        if isinstance(prompt, str):
+            messages = [{"role": "system", "content": prompt}]
+        else:
+            messages = prompt
+        if not self.prompt_cache_size:
+            return self._generate(messages)
+
+        # Prompts embed the whole schema, so they are keyed by digest
+        digest = hashlib.sha256()
+        for message in messages:
+            digest.update(f"{message['role']}\0{message['content']}\0".encode())
+        key = digest.hexdigest()
+        with self._prompt_cache_lock:
+            sql_template = self._prompt_cache.get(key) if use_cache else None
+            if sql_template is not None:
+                self._prompt_cache.move_to_end(key)
+                self.cache_hits += 1
+                return sql_template
+            self.cache_misses += 1
+
+        sql_template = self._generate(messages)
+        with self._prompt_cache_lock:
+            self._prompt_cache[key] = sql_template
+            self._prompt_cache.move_to_end(key)
+            while len(self._prompt_cache) > self.prompt_cache_size:
+                self._prompt_cache.popitem(last=False)
+        return sql_template
+
+    def generate_sql_batch(
+        self, prompts: List[Union[str, List[Dict[str, str]]]], max_workers: int = 8
+    ) -> List[str]:
+        """
+        Generate SQL templates for several prompts with concurrent requests.
+
+        Args:
+            prompts (List[Union[str, List[Dict[str, str]]]]): Prompts as accepted
+                by generate_sql()
+            max_workers (int): Maximum number of requests in flight
+
+        Returns:
+            List[str]: Generated SQL templates, in the order of the prompts
+        """
+        if len(prompts) <= 1:
+            return [self.generate_sql(prompt) for prompt in prompts]
+        # The client is thread-safe and shares one connection pool
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+            return list(pool.map(self.generate_sql, prompts))
+
+    def _generate(self, messages: List[Dict[str, str]]) -> str:
         response = self.client.chat.completions.create(
-            model=self.model, messages=[{"role": "system", "content": prompt}]
+            model=self.model, messages=messages
         )
 
         generated_sql = response.choices[0].message.content.strip()
 
         # Remove ```sql or ``` fences
-        sql_template = re.sub(
-            r"^```sql\s*|^```\s*|```$", "", generated_sql, flags=re.MULTILINE
-        ).strip()
+        sql_template = _FENCE_RE.sub("", generated_sql).strip()
 
         return sql_template
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_generator(cls: type, args: tuple, kwargs: tuple) -> SQLGenerator:
+    return cls(*args, **dict(kwargs))
@@ -1,12 +1,42 @@
+import functools
 import inspect
 import json
 from datetime import datetime
 from types import NoneType
-from typing import Any, Callable, Dict, Optional, Type, Union, get_type_hints
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union,
+    get_args,
+    get_type_hints,
+)
 
 from pydantic import BaseModel
 
 
+@functools.lru_cache(maxsize=None)
+def _resolved_type_hints(func: Callable) -> Dict[str, Any]:
+    return get_type_hints(func)
+
+
+def _cached_type_hints(func: Callable) -> Dict[str, Any]:
+    """
+    Resolved type hints of a function, computed once per function.
+
+    Falls back to the raw annotations while forward references cannot be
+    resolved yet (e.g. the referenced class is defined later in its module);
+    failed lookups are not cached, so they resolve once the module is complete.
+    """
+    try:
+        return _resolved_type_hints(func)
+    except NameError:
+        return dict(func.__annotations__)
+
+
 class FunctionSpec:
 
     def __init__(self, func: Callable):
@@ -18,48 +48,54 @@ class FunctionSpec:
         """
         self.name = func.__name__
         self.return_type, self.wrapper = self._extract_return_model(func)
+        # Whether the declared return type allows None, e.g. Optional[float]
+        self.optional = NoneType in get_args(_cached_type_hints(func).get("return"))
         self.signature = inspect.signature(func)
+        # Rendered once; every prompt for this function reuses the text
+        self.signature_text = str(self.signature)
         self.docstring = inspect.getdoc(func) or ""
-        self.model_fields = self._model_fields()
 
-    def _model_fields(self):
-        if self.return_type in [NoneType, int, str, bool]:
-            return {}
-        return {k: str(v) for k, v in self.return_type.model_fields.items()}
-
-    def _extract_kwargs(self, func: Callable) -> Dict[str, Type]:
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get(cls, func: Callable) -> "FunctionSpec":
         """
-        Extract named parameters and their types from a function.
+        Get the specification of a function, analyzing it only on first use.
 
         Args:
             func (Callable): Function to analyze
 
         Returns:
-            Dict of parameter names and their types
+            FunctionSpec shared by every caller for the same function
         """
-        signature = inspect.signature(func)
-        return {
-            name: param.annotation
-            for name, param in signature.parameters.items()
-            if param.annotation is not param.empty
-        }
+        return cls(func)
+
+    # Model fields are only needed to build a prompt, which most calls never do
+    # once their template is cached, so they are inspected on first use
+    @functools.cached_property
+    def model_fields(self) -> Dict[str, str]:
+        return self._model_fields()
+
+    @functools.cached_property
+    def model_fields_json(self) -> str:
+        # Field descriptions are already strings; serialized once for every prompt
+        return json.dumps(self.model_fields, indent=2)
+
+    def _model_fields(self):
+        if self.return_type in [NoneType, int, str, bool]:
+            return {}
+        return {k: str(v) for k, v in self.return_type.model_fields.items()}
 
     def kwargs_json(self, kwargs: Dict[str, Any]):
         def serialize_value(v):
             if isinstance(v, BaseModel):
-                # Recursively convert nested BaseModel objects to dictionaries
-                model_dict = {}
-                for field_name, field_value in v.model_dump(mode="json").items():
-                    if isinstance(field_value, dict):
-                        model_dict[field_name] = field_value
-                    elif field_value is not None:
-                        model_dict[field_name] = field_value
-                return model_dict
+                # pydantic-core converts nested models and drops unset (None) fields
+                return v.model_dump(mode="json", exclude_none=True)
             if isinstance(v, datetime):  # Handle datetime-like objects
                 return v.isoformat()
             return v
 
-        return json.dumps({k: serialize_value(v) for k, v in kwargs.items()}, indent=2)
+        payload = {k: serialize_value(v) for k, v in kwargs.items()}
+        return json.dumps(payload, indent=2)
 
     def _extract_return_model(self, func: Callable) -> (Type[BaseModel], Optional[str]):
         """
@@ -76,13 +112,17 @@ class FunctionSpec:
         Raises:
             ValueError: If return type is invalid or not a Pydantic model
         """
-        hints = get_type_hints(func)
+        hints = _cached_type_hints(func)
         if "return" not in hints:
             raise ValueError(
                 f"Function {func.__name__} must have a return type annotation"
             )
 
         return_type = hints["return"]
+        if isinstance(return_type, str):
+            raise ValueError(
+                f"Return type {return_type!r} of {func.__name__} cannot be resolved"
+            )
         wrapper = None
 
         # Handle Optional[Model]
@@ -130,6 +170,36 @@ class SQLPromptGenerator:
         self.schema = schema
         self.system_prompt = system_prompt
 
+    # Everything around the call arguments is fixed per function, so it is
+    # formatted once, on the first (re)generation, rather than every time
+    @functools.cached_property
+    def _prompt_static(self) -> str:
+        # Identical for every function sharing the system prompt and schema
+        return f"""
+{self.system_prompt}
+----------------
+Available Tables Schema:
+{self.schema}
+----------------
+"""
+
+    @functools.cached_property
+    def _prompt_head(self) -> str:
+        return f"""Function Name: {self.func_spec.name}
+Function Signature: {self.func_spec.signature_text}
+Function Docstring: {self.func_spec.docstring}
+Function Arguments: """
+
+    @functools.cached_property
+    def _prompt_tail(self) -> str:
+        return f"""
+
+Return model: {self.func_spec.return_type.__name__}
+Model fields: {self.func_spec.model_fields_json}
+
+----------------
+"""
+
     def generate_prompt(
         self,
         kwargs: Dict[str, Any],
@@ -142,6 +212,27 @@ class SQLPromptGenerator:
         Returns:
             str: Detailed prompt with function context and schema
         """
+        return "".join(
+            message["content"]
+            for message in self.generate_messages(kwargs, error, prev_template)
+        )
+
+    def generate_messages(
+        self,
+        kwargs: Dict[str, Any],
+        error: Optional[str] = None,
+        prev_template: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Generate the prompt as chat messages: the system prompt and schema as a
+        system message, followed by the function context as a user message.
+
+        The system message is the same for every function and call, so providers
+        that cache prompt prefixes only bill the per-call part in full.
+
+        Returns:
+            List[Dict[str, str]]: Chat messages forming the prompt
+        """
         error_prompt = ""
         if error:
             error_prompt = f"""
@@ -155,20 +246,11 @@ When running it, following error was encountered:
 Review the error and suggest an improved SQL template that works.
 """
 
-        return f"""
-{self.system_prompt}
-----------------
-Available Tables Schema:
-{self.schema}
-----------------
-Function Name: {self.func_spec.name}
-Function Signature: {self.func_spec.signature}
-Function Docstring: {self.func_spec.docstring}
-Function Arguments: {self.func_spec.kwargs_json(kwargs)}
-
-Return model: {self.func_spec.return_type.__name__}
-Model fields: {json.dumps({k: str(v) for k, v in self.func_spec.model_fields.items()}, indent=2)}
-
-----------------
-{error_prompt}
-"""
+        return [
+            {"role": "system", "content": self._prompt_static},
+            {
+                "role": "user",
+                "content": f"{self._prompt_head}{self.func_spec.kwargs_json(kwargs)}"
+                f"{self._prompt_tail}{error_prompt}\n",
+            },
+        ]
@@ -1,8 +1,12 @@
+import asyncio
 import functools
 import inspect
 import os
+import weakref
 from importlib import resources as impresources
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter
 
 from foundation_sql import db
 from foundation_sql.cache import SQLTemplateCache
@@ -11,6 +15,9 @@ from foundation_sql.prompt import FunctionSpec, SQLPromptGenerator
 
 DEFAULT_SYSTEM_PROMPT = impresources.read_text("foundation_sql", "prompts.md")
 
+# Live decorators, for SQLQueryDecorator.warmup_all()
+_DECORATORS = weakref.WeakSet()
+
 
 class SQLQueryDecorator:
     """
@@ -28,6 +35,26 @@ class SQLQueryDecorator:
         config (SQLGeneratorConfig): Configuration for SQL generation
     """
 
+    # Fixed attributes, no per-instance __dict__. __weakref__ lets the
+    # _DECORATORS WeakSet track decorators without keeping unused ones alive
+    __slots__ = (
+        "name",
+        "regen",
+        "cache_dir",
+        "db_url",
+        "schema",
+        "system_prompt",
+        "cache",
+        "sql_generator",
+        "repair",
+        "trust_db_rows",
+        "async_mode",
+        "auto_reload",
+        "stream_rows",
+        "_functions",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -43,6 +70,13 @@ class SQLQueryDecorator:
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: Optional[str] = None,
+        trust_db_rows: bool = False,
+        async_mode: Literal["native", "thread"] = "native",
+        llm_timeout_s: Optional[float] = None,
+        llm_retries: int = 2,
+        auto_reload: bool = True,
+        prompt_cache_size: int = 0,
+        stream_rows: Optional[int] = None,
     ):
         """
         Initialize the SQL query decorator.
@@ -53,7 +87,30 @@ class SQLQueryDecorator:
             regen (Optional[bool]): SQL template regeneration strategy.
             config (Optional[SQLGeneratorConfig]): Custom configuration
                                                    for SQL generation.
+            trust_db_rows (bool): Build result models with model_construct(),
+                                  skipping validation. Only for rows that already
+                                  match the model: values are not coerced.
+                                  Nested models are constructed the same way.
+            async_mode (str): How async functions reach the database. "native"
+                              uses the async adapter; "thread" runs the sync
+                              engine in a worker thread, for sync-only drivers.
+            llm_timeout_s (Optional[float]): Timeout for each SQL generation request.
+            llm_retries (int): Retries after a timed out or failed generation request.
+            auto_reload (bool): Check cached .sql files for edits on every call.
+                                When False, a template is read once per decorated
+                                function and later calls skip the filesystem.
+            prompt_cache_size (int): Generated templates to remember by exact
+                                     prompt across the decorated functions.
+                                     0 disables the cache.
+            stream_rows (Optional[int]): Fetch the rows of sync list queries through
+                                         a server-side cursor, this many per
+                                         round-trip, instead of buffering them all.
         """
+        if async_mode not in ("native", "thread"):
+            raise ValueError(
+                f"async_mode must be 'native' or 'thread', got {async_mode!r}"
+            )
+
         self.name = name
         self.regen = regen
         self.cache_dir = cache_dir
@@ -88,87 +145,196 @@ class SQLQueryDecorator:
             )
 
         # Initialize cache and SQL generator
-        self.cache = SQLTemplateCache(cache_dir=cache_dir)
-
-        self.sql_generator = SQLGenerator(
-            api_key=api_key, base_url=base_url, model=model
+        self.cache = SQLTemplateCache.shared(cache_dir)
+
+        self.sql_generator = SQLGenerator.shared(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            timeout=llm_timeout_s,
+            max_retries=llm_retries,
+            prompt_cache_size=prompt_cache_size,
         )
 
-        self.repair = repair
+        # Validated once here; None or negative values mean no repair attempts
+        self.repair = max(repair, 0) if isinstance(repair, int) else 0
+        self.trust_db_rows = trust_db_rows
+        self.async_mode = async_mode
+        self.auto_reload = auto_reload
+        self.stream_rows = stream_rows
+        # (template name, prompt generator factory) of every function decorated so far
+        self._functions: List[Tuple[str, Callable[[], SQLPromptGenerator]]] = []
+        _DECORATORS.add(self)
+
+    @classmethod
+    def shared(cls, **kwargs: Any) -> "SQLQueryDecorator":
+        """
+        Get a decorator shared by every caller passing the same settings.
+
+        Creating a decorator resolves the schema (inspecting the database when
+        schema_inspect is set), the template cache and the SQL generator; the
+        shared decorator does this once per distinct set of settings.
+
+        Args:
+            **kwargs: Constructor arguments; they must be hashable
+
+        Returns:
+            SQLQueryDecorator for the settings
+        """
+        return _shared_decorator(cls, tuple(sorted(kwargs.items())))
 
     def __call__(self, func: Callable) -> Callable:
         template_name = self.name or f"{func.__name__}.sql"
-        fn_spec = FunctionSpec(func)
-        prompt_generator = SQLPromptGenerator(
-            fn_spec, template_name, self.system_prompt, self.schema
-        )
+        fn_spec = FunctionSpec.get(func)
+
+        @functools.lru_cache(maxsize=None)
+        def prompt_generator() -> SQLPromptGenerator:
+            # Only needed once a template has to be generated
+            return SQLPromptGenerator(
+                fn_spec, template_name, self.system_prompt, self.schema
+            )
+
+        self._functions.append((template_name, prompt_generator))
+
+        # Template of this function when auto_reload is off; reset on regeneration
+        template_mem: Dict[str, str] = {}
 
         def sql_gen(
             kwargs: Dict[str, Any],
             error: Optional[str] = None,
             prev_template: Optional[str] = None,
         ):
-            if self.regen or not self.cache.exists(template_name) or error:
-                prompt = prompt_generator.generate_prompt(kwargs, error, prev_template)
-                sql_template = self.sql_generator.generate_sql(prompt)
-                self.cache.set(template_name, sql_template)
+            if self.regen or error:
+                sql_template = None
+            elif template_mem:
+                return template_mem[template_name]
             else:
+                # get() serves unchanged templates from memory after a single stat,
+                # so edits to the cached .sql file still take effect
                 sql_template = self.cache.get(template_name)
+            if sql_template is None:
+                prompt = prompt_generator().generate_messages(
+                    kwargs, error, prev_template
+                )
+                # A repair needs a new answer, never the one that just failed
+                sql_template = self.sql_generator.generate_sql(
+                    prompt, use_cache=not error
+                )
+                self.cache.set(template_name, sql_template)
+            if not self.auto_reload:
+                template_mem[template_name] = sql_template
             return sql_template
 
-        def _parse_result(result_data: Any):
-            if fn_spec.wrapper == "list":
-                return [
-                    db.parse_query_to_pydantic(row, fn_spec.return_type)
-                    for row in result_data.all()
-                ]
-            elif isinstance(result_data, int):
+        return_type = fn_spec.return_type
+        # Bound once, so the per-row paths below skip the attribute lookups
+        unflatten = db.unflatten_dict
+        unflatten_rows = db.unflatten_rows
+        parse = db.parse_query_to_pydantic
+
+        # The parser depends only on the declared return type, so it is chosen
+        # once here rather than re-deciding on every call
+        if self.trust_db_rows and _is_model(return_type):
+            construct = db.model_constructor(return_type)
+
+            def to_model(row: Any):
+                return construct(unflatten(row))
+
+        else:
+
+            def to_model(row: Any):
+                return parse(row, return_type)
+
+        # List parsers iterate the result directly: lazy rows stream from the
+        # cursor into the models instead of being buffered in a list first
+        def _parse_list(result_data: Any):
+            return list(map(to_model, result_data))
+
+        def _parse_model_list(result_data: Any):
+            # Validate the whole row set in a single pydantic-core call
+            return rows_adapter.validate_python(unflatten_rows(result_data))
+
+        def _parse_constructed_list(result_data: Any):
+            return list(map(construct, unflatten_rows(result_data)))
+
+        def _parse_one(result_data: Any):
+            if isinstance(result_data, int):
                 return result_data
-            elif fn_spec.return_type is int:
-                # Best-effort mapping from non-int results to int
-                # 1) QueryResult-like object
-                if hasattr(result_data, "scalar") and callable(
-                    getattr(result_data, "scalar")
-                ):
-                    try:
-                        return int(result_data.scalar())
-                    except (ValueError, TypeError):
-                        pass
-                # 2) List of rows
-                if isinstance(result_data, list):
-                    try:
-                        return int(len(result_data))
-                    except Exception:
-                        pass
-                # 3) Dict payloads: common keys or single numeric value
-                if isinstance(result_data, dict):
-                    for k in ("result", "count", "affected", "rowcount"):
-                        v = result_data.get(k)
-                        if isinstance(v, int):
-                            return v
-                    vals = list(result_data.values())
-                    if len(vals) == 1 and isinstance(vals[0], int):
-                        return vals[0]
-                # Fallback
-                return 0
-            else:
-                first_row = result_data.first()
-                return (
-                    db.parse_query_to_pydantic(first_row, fn_spec.return_type)
-                    if first_row
-                    else None
-                )
+            first_row = result_data.first()
+            return to_model(first_row) if first_row else None
+
+        is_list = fn_spec.wrapper == "list"
+        if is_list and _is_model(return_type) and not self.trust_db_rows:
+            rows_adapter = _list_adapter(return_type)
+            _parse_result = _parse_model_list
+        elif is_list and _is_model(return_type):
+            _parse_result = _parse_constructed_list
+        elif is_list:
+            _parse_result = _parse_list
+        elif return_type is int:
+            _parse_result = _parse_int
+        elif return_type is float:
+            _parse_result = _parse_optional_float if fn_spec.optional else _parse_float
+        else:
+            _parse_result = _parse_one
 
         is_async = inspect.iscoroutinefunction(func)
         executor = WrapSqlExecution(
             func=func,
             db_url=self.db_url,
-            repair=self.repair,
+            attempts=self.repair + 1,
             sql_gen=sql_gen,
             parse_result=_parse_result,
+            async_mode=self.async_mode,
+            yield_per=self.stream_rows if is_list else None,
         )
         return executor.build_wrapper(is_async)
 
+    def warmup(self, max_workers: int = 8) -> int:
+        """
+        Generate the templates of all functions decorated so far that have none
+        cached yet, requesting them from the LLM concurrently.
+
+        Prompts are built without call arguments, so templates are generated from
+        the function signatures alone.
+
+        Args:
+            max_workers (int): Maximum number of concurrent LLM requests
+
+        Returns:
+            int: Number of templates generated
+        """
+        missing = [
+            (template_name, prompt_generator)
+            for template_name, prompt_generator in self._functions
+            if self.cache.get(template_name) is None
+        ]
+        if not missing:
+            return 0
+
+        sql_templates = self.sql_generator.generate_sql_batch(
+            [
+                prompt_generator().generate_messages({})
+                for _, prompt_generator in missing
+            ],
+            max_workers=max_workers,
+        )
+        for (template_name, _), sql_template in zip(missing, sql_templates):
+            self.cache.set(template_name, sql_template)
+        return len(missing)
+
+    @classmethod
+    def warmup_all(cls, max_workers: int = 8) -> int:
+        """
+        Warm up every live decorator, e.g. once at startup or before a test run.
+
+        Args:
+            max_workers (int): Maximum number of concurrent LLM requests per decorator
+
+        Returns:
+            int: Number of templates generated
+        """
+        return sum(decorator.warmup(max_workers) for decorator in list(_DECORATORS))
+
     def load_file(self, path: str) -> str:
         """
         Load predefined table schemas.
@@ -176,11 +342,84 @@ class SQLQueryDecorator:
         Returns:
             str: SQL schema definitions
         """
-        if not path or not os.path.exists(path):
+        if not path:
             raise FileNotFoundError(f"Schema file not found at {path}")
+        try:
+            return _read_file(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Schema file not found at {path}") from None
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_decorator(cls: type, kwargs: tuple) -> SQLQueryDecorator:
+    return cls(**dict(kwargs))
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model_class: type) -> TypeAdapter:
+    # Building the validator is the costly part; functions returning the same
+    # model share one
+    return TypeAdapter(List[model_class])
+
+
+@functools.lru_cache(maxsize=256)
+def _read_file(path: str) -> str:
+    # Decorators commonly share one schema/prompt file; it is read once per process
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _is_model(return_type: Any) -> bool:
+    return isinstance(return_type, type) and issubclass(return_type, BaseModel)
+
+
+def _parse_int(result_data: Any) -> int:
+    """Best-effort mapping of a query result to the int a function declared."""
+    if isinstance(result_data, int):
+        return result_data
+    # 1) QueryResult-like object
+    if hasattr(result_data, "scalar") and callable(getattr(result_data, "scalar")):
+        try:
+            return int(result_data.scalar())
+        except (ValueError, TypeError):
+            pass
+    # 2) List of rows
+    if isinstance(result_data, list):
+        try:
+            return int(len(result_data))
+        except Exception:
+            pass
+    # 3) Dict payloads: common keys or single numeric value
+    if isinstance(result_data, dict):
+        for k in ("result", "count", "affected", "rowcount"):
+            v = result_data.get(k)
+            if isinstance(v, int):
+                return v
+        if len(result_data) == 1:
+            v = next(iter(result_data.values()))
+            if isinstance(v, int):
+                return v
+    # Fallback
+    return 0
+
+
+def _parse_float(result_data: Any) -> float:
+    """Map a query result to the float a function declared, e.g. an AVG() aggregate.
+
+    The first column of the first row is read directly, without building a model.
+    """
+    if isinstance(result_data, int):
+        return float(result_data)
+    value = result_data.scalar()
+    return float(value) if value is not None else 0.0
 
-        with open(path, "r") as f:
-            return f.read()
+
+def _parse_optional_float(result_data: Any) -> Optional[float]:
+    """Like _parse_float(), but NULL (e.g. AVG() over no rows) is returned as None."""
+    if isinstance(result_data, int):
+        return float(result_data)
+    value = result_data.scalar()
+    return float(value) if value is not None else None
 
 
 class WrapSqlExecution:
@@ -189,29 +428,80 @@ class WrapSqlExecution:
         self,
         func: Callable,
         db_url: str,
-        repair: Optional[int],
+        attempts: int,
         sql_gen: Callable[[Dict[str, Any], Optional[str], Optional[str]], str],
         parse_result: Callable[[Any], Any],
+        async_mode: str = "native",
+        yield_per: Optional[int] = None,
     ) -> None:
         self.func = func
         self.db_url = db_url
-        self.repair = repair
+        self.attempts = attempts
         self.sql_gen = sql_gen
         self._parse_result = parse_result
+        self._run_sql_async = (
+            self._run_sql_in_thread if async_mode == "thread" else self._run_sql_native
+        )
+        self._run_many_async = (
+            self._run_many_in_thread
+            if async_mode == "thread"
+            else self._run_many_native
+        )
+        self.yield_per = yield_per
+        self._run_sql_sync = self._run_sql_streamed if yield_per else self._run_sql
+        if yield_per:
+
+            def parse_streamed(result_data: Any):
+                # A parser failing mid-stream must still release the cursor
+                # and its connection
+                try:
+                    return parse_result(result_data)
+                finally:
+                    if isinstance(result_data, db.QueryResult):
+                        result_data.close()
+
+            self._parse_result = parse_streamed
+
+    def _run_sql(self, sql_template: str, kwargs: Dict[str, Any]):
+        return db.run_sql(self.db_url, sql_template, **kwargs)
+
+    def _run_sql_streamed(self, sql_template: str, kwargs: Dict[str, Any]):
+        # Rows are parsed as they arrive; the connection is released once the
+        # parser has consumed them all
+        database = db.get_db(self.db_url)
+        try:
+            return database.stream_sql(sql_template, yield_per=self.yield_per, **kwargs)
+        except db.NotStreamableError:
+            # Not a single SELECT, so there is no cursor to stream from
+            return database.run_sql(sql_template, **kwargs)
+
+    async def _run_sql_native(self, sql_template: str, kwargs: Dict[str, Any]):
+        database = db.get_db_async(self.db_url)
+        return await database.run_sql_async(sql_template, **kwargs)
+
+    async def _run_sql_in_thread(self, sql_template: str, kwargs: Dict[str, Any]):
+        # Blocking calls on the pooled sync engine run in a worker thread
+        return await asyncio.to_thread(db.run_sql, self.db_url, sql_template, **kwargs)
+
+    async def _execute_once_async(self, **kwargs: Any):
+        sql_template = self.sql_gen(kwargs, None, None)
+        result_data = await self._run_sql_async(sql_template, kwargs)
+        return self._parse_result(result_data)
+
+    def _execute_once_sync(self, **kwargs: Any):
+        sql_template = self.sql_gen(kwargs, None, None)
+        result_data = self._run_sql_sync(sql_template, kwargs)
+        return self._parse_result(result_data)
 
     async def _execute_async(self, **kwargs: Any):
         last_exc = None
         error = None
         sql_template = None
-        attempts = (
-            self.repair + 1 if isinstance(self.repair, int) and self.repair >= 0 else 1
-        )
-        database = db.get_db_with_adapter(self.db_url, "async")
 
-        for _ in range(attempts):
+        for _ in range(self.attempts):
             sql_template = self.sql_gen(kwargs, error, sql_template)
             try:
-                result_data = await database.run_sql_async(sql_template, **kwargs)
+                result_data = await self._run_sql_async(sql_template, kwargs)
                 try:
                     return self._parse_result(result_data)
                 except Exception as parse_err:
@@ -220,7 +510,12 @@ class WrapSqlExecution:
                     continue
             except Exception as exec_err:
                 last_exc = exec_err
-                error = f"Execution error: {exec_err}"
+                # A lost connection says nothing about the SQL: retry the same
+                # template rather than asking the LLM to rewrite it
+                if db.is_transient_error(exec_err):
+                    error = None
+                else:
+                    error = f"Execution error: {exec_err}"
                 continue
 
         if last_exc:
@@ -231,14 +526,11 @@ class WrapSqlExecution:
         last_exc = None
         error = None
         sql_template = None
-        attempts = (
-            self.repair + 1 if isinstance(self.repair, int) and self.repair >= 0 else 1
-        )
 
-        for _ in range(attempts):
+        for _ in range(self.attempts):
             sql_template = self.sql_gen(kwargs, error, sql_template)
             try:
-                result_data = db.run_sql(self.db_url, sql_template, **kwargs)
+                result_data = self._run_sql_sync(sql_template, kwargs)
                 try:
                     return self._parse_result(result_data)
                 except Exception as parse_err:
@@ -247,25 +539,84 @@ class WrapSqlExecution:
                     continue
             except Exception as exec_err:
                 last_exc = exec_err
-                error = f"Execution error: {exec_err}"
+                # A lost connection says nothing about the SQL: retry the same
+                # template rather than asking the LLM to rewrite it
+                if db.is_transient_error(exec_err):
+                    error = None
+                else:
+                    error = f"Execution error: {exec_err}"
                 continue
 
         if last_exc:
             raise last_exc
         raise RuntimeError("SQL generation failed without explicit exception")
 
+    def run_many(self, calls: Iterable[Dict[str, Any]]) -> int:
+        """
+        Run a write function once per set of keyword arguments in one batch.
+
+        The function's template is rendered for every call and the statements
+        are sent with executemany, instead of one round-trip per call.
+
+        Args:
+            calls (Iterable[Dict[str, Any]]): Keyword arguments of each call
+
+        Returns:
+            int: Total number of rows affected
+        """
+        calls = list(calls)
+        if not calls:
+            return 0
+        sql_template = self.sql_gen(calls[0], None, None)
+        return db.get_db(self.db_url).run_many(sql_template, calls)
+
+    async def run_many_async(self, calls: Iterable[Dict[str, Any]]) -> int:
+        """
+        Async version of run_many().
+
+        Args:
+            calls (Iterable[Dict[str, Any]]): Keyword arguments of each call
+
+        Returns:
+            int: Number of executions with asyncpg, rows affected otherwise
+        """
+        calls = list(calls)
+        if not calls:
+            return 0
+        sql_template = self.sql_gen(calls[0], None, None)
+        return await self._run_many_async(sql_template, calls)
+
+    async def _run_many_native(
+        self, sql_template: str, calls: List[Dict[str, Any]]
+    ) -> int:
+        database = db.get_db_async(self.db_url)
+        return await database.run_many_async(sql_template, calls)
+
+    async def _run_many_in_thread(
+        self, sql_template: str, calls: List[Dict[str, Any]]
+    ) -> int:
+        database = db.get_db(self.db_url)
+        return await asyncio.to_thread(database.run_many, sql_template, calls)
+
     def build_wrapper(self, is_async: bool):
+        # Without repair attempts there is nothing to retry, so skip the loop
+        single = self.attempts == 1
         if is_async:
+            execute_async = self._execute_once_async if single else self._execute_async
 
             @functools.wraps(self.func)
             async def async_wrapper(**kwargs: Any):
-                return await self._execute_async(**kwargs)
+                return await execute_async(**kwargs)
 
+            async_wrapper.many = self.run_many_async
             return async_wrapper
         else:
+            execute_sync = self._execute_once_sync if single else self._execute_sync
 
             @functools.wraps(self.func)
             def sync_wrapper(**kwargs: Any):
-                return self._execute_sync(**kwargs)
+                return execute_sync(**kwargs)
 
+            # e.g. create_user.many([{"user": a}, {"user": b}])
+            sync_wrapper.many = self.run_many
             return sync_wrapper
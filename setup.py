@@ -29,6 +29,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={"uvloop": ["uvloop"], "orjson": ["orjson"]},
     include_package_data=True,
     package_data={
         "foundation_sql": ["__sql__/*"],
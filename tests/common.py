@@ -1,22 +1,32 @@
 import os
+import pathlib
 import re
 import unittest
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
 from foundation_sql import db
 from foundation_sql.query import SQLQueryDecorator
 
-load_dotenv()
+# CI provides the environment directly; LOAD_DOTENV=0 skips reading .env
+if os.environ.get("LOAD_DOTENV", "1") == "1":
+    load_dotenv()
 
 # Force SQLite in-memory for all tests that use this common module.
 # Async/Postgres-specific tests manage their own DATABASE_URL and are skipped if absent.
 DB_URL = "sqlite:///:memory:"
 
+# Tables created by a schema script: emptied after each test, dropped after the class
+_CREATE_RE = re.compile(
+    r"CREATE\s+TABLE\s+IF\s+NOT\s+EXISTS\s+([a-zA-Z_][a-zA-Z0-9_\.]*)", re.IGNORECASE
+)
+
 
 def create_query(schema=None, schema_inspect=False, db_url=DB_URL):
-    return SQLQueryDecorator(
+    # Modules with the same settings share one decorator, so schema inspection
+    # and client setup happen once per distinct (schema, db_url, schema_inspect)
+    return SQLQueryDecorator.shared(
         schema=schema,
         schema_inspect=schema_inspect,
         db_url=db_url,
@@ -27,51 +37,97 @@ def create_query(schema=None, schema_inspect=False, db_url=DB_URL):
     )
 
 
+def write_template(cache_dir: str, name: str, sql: str) -> None:
+    """Seed a SQL template, rewriting the file only when its content changed.
+
+    Unchanged files keep their mtime, so templates already loaded by the
+    decorators stay cached; stale templates for other functions are kept too.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = pathlib.Path(cache_dir, name)
+    try:
+        if path.read_text() == sql:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_text(sql)
+
+
 class DatabaseTests(unittest.TestCase):
     """Base test class for database-driven tests with common setup and helper methods."""
 
     db_url = DB_URL
     schema_sql = None
     schema_path = None
+    _tables_to_drop: List[str] = []
+    # Whether the schema has been created on this class's database
+    _schema_ready = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Capture table names from schema_sql for teardown cleanup; the schema is
+        # fixed per class, so it is scanned once rather than in every setUp
+        cls._tables_to_drop = _CREATE_RE.findall(cls.schema_sql or "")
 
     def setUp(self):
-        """Create a fresh database connection for each test."""
-        # Re-initialize the schema for each test to ensure clean state
-        if (self.schema_sql or self.schema_path) and self.db_url:
+        """Create the schema, once per class."""
+        # The database outlives each test (see tearDownClass), so the DDL is
+        # parsed and run once; tearDown empties the tables instead of dropping them
+        cls = type(self)
+        if (
+            (self.schema_sql or self.schema_path)
+            and self.db_url
+            and not cls._schema_ready
+        ):
             db.get_db(self.db_url).init_schema(
                 schema_sql=self.schema_sql, schema_path=self.schema_path
             )
-            # Capture table names from schema_sql for teardown cleanup
-            self._tables_to_drop = []
-            if self.schema_sql:
-                for raw in self.schema_sql.split(";"):
-                    stmt = raw.strip()
-                    if not stmt:
-                        continue
-                    m = re.search(
-                        r"CREATE\s+TABLE\s+IF\s+NOT\s+EXISTS\s+([a-zA-Z_][a-zA-Z0-9_\.]*)",
-                        stmt,
-                        re.IGNORECASE,
-                    )
-                    if m:
-                        self._tables_to_drop.append(m.group(1))
-        else:
-            pass
+            cls._schema_ready = True
 
     def tearDown(self):
-        """Close the database connection after each test."""
-        # Best-effort cleanup of tables created by this test to avoid cross-test interference
-        try:
-            if getattr(self, "_tables_to_drop", None):
-                database = db.get_db(self.db_url)
-                # Drop in reverse order to reduce FK issues
-                for t in reversed(self._tables_to_drop):
-                    try:
-                        database.execute(f"DROP TABLE IF EXISTS {t} CASCADE")
-                    except Exception:
-                        pass
-        finally:
-            for _, connection in db.DATABASES.items():
-                connection.get_engine().dispose()
-            db.DATABASES.clear()
+        """Empty the tables used by this test, keeping the schema and connection pool."""
+        self._clear_tables(drop=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the tables and close the database connections once the class is done."""
+        cls._clear_tables(drop=True)
+        cls._schema_ready = False
+        # Engines (and their pooled connections) are reused by every test of the
+        # class, so connect and authenticate costs are paid once per class
+        for _, connection in db.DATABASES.items():
+            connection.get_engine().dispose()
         db.DATABASES.clear()
+        super().tearDownClass()
+
+    @classmethod
+    def _clear_tables(cls, drop: bool) -> None:
+        # Clean up the class's tables to avoid cross-test interference
+        if not cls._tables_to_drop:
+            return
+        database = db.get_db(cls.db_url)
+        # Reverse creation order, so referencing tables go first
+        tables = list(reversed(cls._tables_to_drop))
+        postgres = database.get_engine().dialect.name == "postgresql"
+        if drop:
+            # SQLite has no CASCADE
+            cascade = " CASCADE" if postgres else ""
+            statements = [f"DROP TABLE IF EXISTS {t}{cascade}" for t in tables]
+        elif postgres:
+            # Emptied tables restart their ids, as freshly created ones would
+            statements = [
+                f"TRUNCATE TABLE {', '.join(tables)} RESTART IDENTITY CASCADE"
+            ]
+        else:
+            statements = [f"DELETE FROM {t}" for t in tables]
+            if "AUTOINCREMENT" in (cls.schema_sql or "").upper():
+                statements.append("DELETE FROM sqlite_sequence")
+        # One script, so the statements share a single round-trip where the
+        # driver allows it
+        try:
+            database.run_sql(";\n".join(statements))
+        except Exception as e:
+            # Tables the test never got to create are fine; any other failure
+            # would leak rows into the next test
+            if "no such table" not in str(e) and "does not exist" not in str(e):
+                raise
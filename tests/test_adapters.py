@@ -1,9 +1,22 @@
+import asyncio
+import json
 import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
+from unittest import mock
+
+import jinja2
+from jinja2sql import Jinja2SQL
 
 from foundation_sql import db
-from foundation_sql.db_drivers import SQLAlchemyAdapter
+from foundation_sql.db_drivers import (
+    AsyncpgAdapter,
+    SQLAlchemyAdapter,
+    _split_statements,
+    _template_compiler,
+)
 
 SYNC_DB_URL = "sqlite:///:memory:"
 
@@ -56,12 +69,151 @@ class TestSQLAlchemyAdapter(unittest.TestCase):
         self.assertEqual(rows[0]["id"], 1)
         self.assertEqual(rows[0]["name"], "alpha")
 
+    def test_rows_are_plain_dicts(self):
+        self.adapter.run_sql(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+
+        row = database.run_sql(SELECT_TEMPLATE).first()
+        self.assertIs(type(row), dict)
+        row["extra"] = True
+        self.assertEqual(
+            json.loads(json.dumps(row)), {"id": 1, "name": "alpha", "extra": True}
+        )
+
+        with database.stream_sql(SELECT_TEMPLATE) as result:
+            self.assertIs(type(result.first()), dict)
+
+    def test_init_schema_runs_script(self):
+        self.adapter.init_schema(
+            "CREATE TABLE IF NOT EXISTS a (id INTEGER);"
+            "CREATE TABLE IF NOT EXISTS b (note TEXT DEFAULT 'x;y');"
+        )
+        rc = self.adapter.run_sql("INSERT INTO b DEFAULT VALUES;", {})
+        self.assertEqual(rc, 1)
+        rows = self.adapter.run_sql("SELECT note FROM b;", {})
+        self.assertEqual(rows[0]["note"], "x;y")
+
+        with self.assertRaises(RuntimeError):
+            self.adapter.init_schema("CREATE TABLE broken (;")
+
+    def test_init_schema_from_path(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".sql", delete=False) as f:
+            f.write("CREATE TABLE IF NOT EXISTS from_file (id INTEGER);")
+        try:
+            database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+            database.init_schema(schema_path=f.name)
+            self.assertEqual(database.run_sql("SELECT id FROM from_file;").count(), 0)
+        finally:
+            os.remove(f.name)
+
+    def test_template_compiled_once(self):
+        self.adapter.run_sql(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
+        self.adapter.run_sql(INSERT_TEMPLATE, {"id": 2, "name": "beta"})
+        info = self.adapter._compile.cache_info()
+        self.assertGreaterEqual(info.hits, 1)
+
+        rows = self.adapter.run_sql(SELECT_TEMPLATE, {})
+        self.assertEqual([r["name"] for r in rows], ["alpha", "beta"])
+
+    def test_compiled_templates_shared_across_adapters(self):
+        other = SQLAlchemyAdapter(SYNC_DB_URL)
+        try:
+            self.assertIs(other._compile, self.adapter._compile)
+            self.adapter._render(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
+            hits = self.adapter._compile.cache_info().hits
+            other._render(INSERT_TEMPLATE, {"id": 2, "name": "beta"})
+            self.assertEqual(other._compile.cache_info().hits, hits + 1)
+        finally:
+            other.close()
+
+    def test_bytecode_cache_skips_compiling_in_new_process(self):
+        with tempfile.TemporaryDirectory() as bytecode_dir:
+
+            def new_process_compiler():
+                env = jinja2.Environment(
+                    bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_dir)
+                )
+                j2sql = Jinja2SQL(env, param_style="named")
+                return j2sql, _template_compiler(j2sql)
+
+            _, compile_template = new_process_compiler()
+            compile_template(INSERT_TEMPLATE)
+            self.assertTrue(os.listdir(bytecode_dir))
+
+            j2sql, compile_template = new_process_compiler()
+            with mock.patch.object(
+                j2sql.env, "compile", side_effect=AssertionError("recompiled")
+            ):
+                compiled = compile_template(INSERT_TEMPLATE)
+            _, params = j2sql.from_file(compiled, context={"id": 1, "name": "a"})
+            self.assertEqual(list(params.values()), [1, "a"])
+
+    def test_static_sql_skips_jinja(self):
+        misses = self.adapter._compile.cache_info().misses
+        self.assertEqual(
+            self.adapter._render(SELECT_TEMPLATE, {}), (SELECT_TEMPLATE, {})
+        )
+        self.assertEqual(self.adapter._compile.cache_info().misses, misses)
+
+    def test_now_available_without_mutating_context(self):
+        data: Dict[str, Any] = {}
+        rows = self.adapter.run_sql("SELECT {{ now().year }} AS year;", data)
+        self.assertGreater(rows[0]["year"], 2000)
+        self.assertEqual(data, {})
+
+    def test_tojson_inside_blocks_matches_jinja_escaping(self):
+        template = "{% set tags = value | tojson %}{{ tags }}"
+        value = {"b": "<'x'>", "a": [1, None]}
+        rendered, params = self.adapter._render(template, {"value": value})
+        # Same HTML-safe escaping as Jinja's own tojson, whichever encoder is used
+        self.assertEqual(params, {})
+        self.assertNotIn("<", rendered)
+        self.assertNotIn("'", rendered)
+        self.assertEqual(
+            json.loads(rendered),
+            json.loads(
+                jinja2.Environment()
+                .from_string("{{ value | tojson }}")
+                .render(value=value)
+            ),
+        )
+
+    def test_tojson_inside_blocks_accepts_json_options(self):
+        def render(template, value):
+            return self.adapter._render(
+                "{% set v = value | " + template + " %}{{ v }}", {"value": value}
+            )[0]
+
+        self.assertEqual(json.loads(render("tojson", {1: "a"})), {"1": "a"})
+        self.assertEqual(json.loads(render("tojson", 2**70)), 2**70)
+        self.assertEqual(render("tojson(indent=2)", [1]), "[\n  1\n]")
+
+    def test_split_statements_ignores_quoted_semicolons(self):
+        self.assertEqual(_split_statements("SELECT 1;"), ["SELECT 1"])
+        self.assertEqual(
+            _split_statements("INSERT INTO t VALUES ('a;b'); SELECT 1 -- x;y\n;"),
+            ["INSERT INTO t VALUES ('a;b')", "SELECT 1 -- x;y"],
+        )
+        function = (
+            "CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql"
+        )
+        self.assertEqual(
+            _split_statements(f"{function}; SELECT $1; DO $$ BEGIN NULL; END $$;"),
+            [function, "SELECT $1", "DO $$ BEGIN NULL; END $$"],
+        )
+
+        self.adapter.run_sql("INSERT INTO items (id, name) VALUES (1, 'a;b');", {})
+        rows = self.adapter.run_sql(SELECT_TEMPLATE, {})
+        self.assertEqual(rows[0]["name"], "a;b")
+
     def test_database_facade_run_sql_parity(self):
         # Ensure Database facade wraps adapter correctly
         database = db.Database(SYNC_DB_URL, adapter=self.adapter)
-        # seed two rows using adapter path
-        _ = self.adapter.run_sql(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
-        _ = self.adapter.run_sql(INSERT_TEMPLATE, {"id": 2, "name": "beta"})
+        # seed two rows using adapter path, in one executemany batch
+        seeded = self.adapter.run_many(
+            INSERT_TEMPLATE, [{"id": 1, "name": "alpha"}, {"id": 2, "name": "beta"}]
+        )
+        self.assertEqual(seeded, 2)
         # Insert
         affected = database.run_sql(INSERT_TEMPLATE, id=3, name="gamma")
         self.assertEqual(affected, 1)
@@ -70,6 +222,214 @@ class TestSQLAlchemyAdapter(unittest.TestCase):
         self.assertTrue(hasattr(result, "first"))
         self.assertEqual(result.count(), 3)
 
+    def test_transaction_shares_connection(self):
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+        with database.transaction():
+            database.run_sql(INSERT_TEMPLATE, id=1, name="alpha")
+            self.assertEqual(database.run_sql(SELECT_TEMPLATE).count(), 1)
+
+        with self.assertRaises(RuntimeError):
+            with database.transaction():
+                database.run_sql(INSERT_TEMPLATE, id=2, name="beta")
+                database.run_sql(INSERT_TEMPLATE, id=2, name="duplicate")
+
+        # The failed transaction is rolled back as a whole
+        result = database.run_sql(SELECT_TEMPLATE)
+        self.assertEqual([r["name"] for r in result.all()], ["alpha"])
+
+    def test_stream_sql_reads_rows_lazily(self):
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+        for i in range(5):
+            database.run_sql(INSERT_TEMPLATE, id=i, name=f"item{i}")
+
+        with database.stream_sql(SELECT_TEMPLATE, yield_per=2) as result:
+            self.assertEqual(result.first()["name"], "item0")
+            self.assertEqual([r["id"] for r in result], [0, 1, 2, 3, 4])
+
+        with self.assertRaises(db.NotStreamableError):
+            database.stream_sql(INSERT_TEMPLATE, id=9, name="x")
+
+    def test_qmark_placeholders_rewritten(self):
+        self.assertEqual(db._qmark_to_named("SELECT ? + ?"), "SELECT :p0 + :p1")
+        self.assertEqual(
+            db._qmark_to_named("SELECT '?', ? FROM t WHERE a = ?"),
+            "SELECT '?', :p0 FROM t WHERE a = :p1",
+        )
+
+    def test_memory_database_shared_across_threads(self):
+        self.adapter.run_sql(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            rows = pool.submit(self.adapter.run_sql, SELECT_TEMPLATE, {}).result()
+        self.assertEqual([r["name"] for r in rows], ["alpha"])
+
+    def test_named_memory_database_shared_across_threads(self):
+        adapter = SQLAlchemyAdapter("sqlite:///file:named?mode=memory&uri=true")
+        try:
+            adapter.init_schema(TEST_SCHEMA)
+            adapter.run_sql(INSERT_TEMPLATE, {"id": 1, "name": "alpha"})
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                rows = pool.submit(adapter.run_sql, SELECT_TEMPLATE, {}).result()
+            self.assertEqual([r["name"] for r in rows], ["alpha"])
+        finally:
+            adapter.close()
+
+    def test_get_db_keys_on_engine_options(self):
+        default = db.get_db(SYNC_DB_URL)
+        tuned = db.get_db(SYNC_DB_URL, echo=True)
+        self.assertIs(default, db.get_db(SYNC_DB_URL))
+        self.assertIsNot(default, tuned)
+        self.assertTrue(tuned.get_engine().echo)
+
+    def test_get_db_async_reuses_instance_per_loop(self):
+        url = "postgresql://localhost/test"
+
+        async def lookup():
+            database = db.get_db_async(url)
+            self.assertIs(database, db.get_db_async(url))
+            return database
+
+        first = asyncio.run(lookup())
+        self.assertIsInstance(first.adapter, AsyncpgAdapter)
+        self.assertIsNot(first, asyncio.run(lookup()))
+
+    def test_init_schema_async_splits_non_transactional_scripts(self):
+        adapter = AsyncpgAdapter("postgresql://localhost/test")
+        conn = mock.AsyncMock()
+        adapter.pool = mock.MagicMock()
+        adapter.pool.acquire.return_value.__aenter__.return_value = conn
+
+        script = "CREATE TABLE t (id INT); CREATE INDEX i ON t (id);"
+        asyncio.run(adapter.init_schema_async(script))
+        self.assertEqual(conn.execute.await_args_list, [mock.call(script)])
+
+        # Statements that cannot run in a transaction block go one by one
+        conn.execute.reset_mock()
+        asyncio.run(
+            adapter.init_schema_async(
+                "CREATE TABLE t (id INT); CREATE INDEX CONCURRENTLY i ON t (id);"
+            )
+        )
+        self.assertEqual(
+            conn.execute.await_args_list,
+            [
+                mock.call("CREATE TABLE t (id INT)"),
+                mock.call("CREATE INDEX CONCURRENTLY i ON t (id)"),
+            ],
+        )
+
+    def test_close_async_dbs_releases_loop_instances(self):
+        url = "postgresql://localhost/test"
+
+        async def open_and_close():
+            database = db.get_db_async(url)
+            database.adapter.pool = mock.AsyncMock()
+            pool = database.adapter.pool
+            await db.close_async_dbs()
+            pool.close.assert_awaited_once()
+            self.assertNotIn(asyncio.get_running_loop(), db._ASYNC_DATABASES)
+            self.assertIsNot(database, db.get_db_async(url))
+
+        asyncio.run(open_and_close())
+        # The instance reopened above was never closed; the next loop drops it
+        asyncio.run(open_and_close())
+        self.assertEqual(len(db._ASYNC_DATABASES), 1)
+        db._ASYNC_DATABASES.clear()
+
+    def test_extract_schema_cached_until_refresh(self):
+        url = "sqlite://"
+        try:
+            database = db.get_db(url)
+            database.init_schema("CREATE TABLE first (id INTEGER);")
+            self.assertIn("first", db.extract_schema_from_db(url))
+
+            database.init_schema("CREATE TABLE second (id INTEGER);")
+            self.assertNotIn("second", db.extract_schema_from_db(url))
+            self.assertIn("second", db.extract_schema_from_db(url, refresh=True))
+        finally:
+            db._SCHEMA_CACHE.pop(url, None)
+
+    def test_execute_batches_parameter_sets(self):
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+        affected = database.execute(
+            "INSERT INTO items (id, name) VALUES (?, ?)",
+            [(1, "alpha"), (2, "beta"), (3, "gamma")],
+        )
+        self.assertEqual(affected, 3)
+        rows = database.execute("SELECT name FROM items WHERE id > ? ORDER BY id", (1,))
+        self.assertEqual([r[0] for r in rows], ["beta", "gamma"])
+
+    def test_bulk_insert(self):
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+        rows = ((i, f"item{i}") for i in range(3))
+        self.assertEqual(database.bulk_insert("items", ["id", "name"], rows), 3)
+        self.assertEqual(database.bulk_insert("items", ["id", "name"], []), 0)
+        result = database.run_sql(SELECT_TEMPLATE)
+        self.assertEqual([r["name"] for r in result], ["item0", "item1", "item2"])
+
+    def test_execute_streams_chunks(self):
+        database = db.Database(SYNC_DB_URL, adapter=self.adapter)
+        database.execute(
+            "INSERT INTO items (id, name) VALUES (?, ?)",
+            [(i, f"item{i}") for i in range(5)],
+        )
+        chunks = database.execute("SELECT id FROM items ORDER BY id", chunk_size=2)
+        self.assertEqual(
+            [[r[0] for r in chunk] for chunk in chunks], [[0, 1], [2, 3], [4]]
+        )
+
+        # Writes are never run on the uncommitted chunked path
+        with self.assertRaises(ValueError):
+            database.execute("DELETE FROM items", chunk_size=2)
+        self.assertEqual(database.run_sql(SELECT_TEMPLATE).count(), 5)
+
+
+class TestQueryResult(unittest.TestCase):
+    def test_lazy_rows_are_read_on_demand(self):
+        pulled = []
+        closed = []
+
+        def source():
+            for i in range(3):
+                pulled.append(i)
+                yield {"id": i}
+
+        result = db.QueryResult(source(), close=lambda: closed.append(True))
+        self.assertEqual(result.first(), {"id": 0})
+        self.assertEqual(pulled, [0])
+        self.assertFalse(closed)
+
+        self.assertEqual(result.count(), 3)
+        self.assertEqual(closed, [True])
+        self.assertEqual([r["id"] for r in result], [0, 1, 2])
+
+    def test_is_empty_and_count_after_streaming(self):
+        result = db.QueryResult(iter([{"id": 1}, {"id": 2}]))
+        self.assertTrue(result.exists())
+        self.assertEqual([r["id"] for r in result], [1, 2])
+        self.assertFalse(result.is_empty())
+        self.assertEqual(result.count(), 2)
+
+        self.assertTrue(db.QueryResult(iter([])).is_empty())
+
+    def test_all_after_streaming_raises(self):
+        result = db.QueryResult(iter([{"id": 1}, {"id": 2}]))
+        self.assertEqual(len(list(result)), 2)
+        self.assertEqual(result.count(), 2)
+        with self.assertRaises(RuntimeError):
+            result.all()
+
+        # Rows buffered before iterating stay available
+        result = db.QueryResult(iter([{"id": 1}, {"id": 2}]))
+        self.assertEqual(len(result.all()), 2)
+        self.assertEqual(len(list(result)), 2)
+        self.assertEqual(len(result.all()), result.count())
+
+    def test_context_manager_closes_source(self):
+        closed = []
+        with db.QueryResult(iter([{"id": 1}]), close=lambda: closed.append(True)) as r:
+            self.assertEqual(r.scalar(), 1)
+        self.assertEqual(closed, [True])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
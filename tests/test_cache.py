@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from foundation_sql.cache import SQLTemplateCache
+
+
+class TestSQLTemplateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SQLTemplateCache(cache_dir=self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_get_serves_unchanged_file_from_memory(self):
+        self.cache.set("q.sql", "SELECT 1")
+        with mock.patch("builtins.open", side_effect=AssertionError("file read")):
+            self.assertEqual(self.cache.get("q.sql"), "SELECT 1")
+
+    def test_get_rereads_when_file_changes(self):
+        self.cache.set("q.sql", "SELECT 1")
+        path = os.path.join(self.tmp.name, "q.sql")
+        with open(path, "w") as f:
+            f.write("SELECT 2")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(self.cache.get("q.sql"), "SELECT 2")
+
+    def test_set_replaces_file_atomically(self):
+        self.cache.set("q.sql", "SELECT 1")
+        with mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.cache.set("q.sql", "SELECT 2")
+
+        # The previous template is intact and no temporary files are left behind
+        self.assertEqual(os.listdir(self.tmp.name), ["q.sql"])
+        self.assertEqual(self.cache.get("q.sql"), "SELECT 1")
+
+    def test_set_uses_regular_file_permissions(self):
+        path = os.path.join(self.tmp.name, "q.sql")
+        with open(path, "w"):
+            pass
+        expected = os.stat(path).st_mode & 0o777
+        os.remove(path)
+
+        # New files honour the umask like open(..., "w") does
+        self.cache.set("q.sql", "SELECT 1")
+        self.assertEqual(os.stat(path).st_mode & 0o777, expected)
+
+        # Replaced files keep their permissions
+        os.chmod(path, 0o640)
+        self.cache.set("q.sql", "SELECT 2")
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+
+    def test_set_accepts_keys_in_subdirectories(self):
+        os.makedirs(os.path.join(self.tmp.name, "reports"))
+        self.cache.set("reports/q.sql", "SELECT 1")
+
+        self.assertEqual(os.listdir(os.path.join(self.tmp.name, "reports")), ["q.sql"])
+        self.assertEqual(self.cache.get("reports/q.sql"), "SELECT 1")
+
+    def test_clear_invalidates_memory(self):
+        self.cache.set("q.sql", "SELECT 1")
+        self.cache.clear("q.sql")
+        self.assertFalse(self.cache.exists("q.sql"))
+        self.assertIsNone(self.cache.get("q.sql"))
+
+    def test_preload_reads_directory_once(self):
+        for name in ("a.sql", "b.sql"):
+            with open(os.path.join(self.tmp.name, name), "w") as f:
+                f.write(f"-- {name}")
+
+        self.assertEqual(self.cache.preload(), 2)
+        with mock.patch("builtins.open", side_effect=AssertionError("file read")):
+            self.assertEqual(self.cache.get("a.sql"), "-- a.sql")
+            self.assertEqual(self.cache.get("b.sql"), "-- b.sql")
+
+    def test_memory_keeps_recently_used_templates(self):
+        cache = SQLTemplateCache(cache_dir=self.tmp.name, max_size=2)
+        for name in ("a.sql", "b.sql"):
+            cache.set(name, f"-- {name}")
+        cache.get("a.sql")
+        cache.set("c.sql", "-- c.sql")
+
+        self.assertEqual(list(cache._mem), ["a.sql", "c.sql"])
+        # Evicted templates are read from disk again
+        self.assertEqual(cache.get("b.sql"), "-- b.sql")
+
+    def test_shared_cache_per_directory(self):
+        shared = SQLTemplateCache.shared(self.tmp.name)
+        self.assertIs(shared, SQLTemplateCache.shared(self.tmp.name + os.sep))
+        self.assertIsNot(
+            shared, SQLTemplateCache.shared(os.path.join(self.tmp.name, "other"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
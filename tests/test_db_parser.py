@@ -5,9 +5,10 @@ Tests for the database query parser functions.
 import unittest
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
+import sqlalchemy
+from pydantic import BaseModel, ConfigDict, Field
 
 from foundation_sql import db
 from tests import common
@@ -271,6 +272,108 @@ class TestDbParser(common.DatabaseTests):
         # Check that agent is None
         self.assertIsNone(result.agent)
 
+    def test_unflatten_collapses_empty_nested_objects(self):
+        """Test that nested objects holding only None values collapse to None."""
+        data = {
+            "agent.model.id": None,
+            "id": "1",
+            "agent.id": "2",
+            "parent_task.id": None,
+            "agent.model.name": None,
+            "parent_task.agent.id": None,
+        }
+
+        self.assertEqual(
+            db.unflatten_dict(data),
+            {"id": "1", "agent": {"id": "2", "model": None}, "parent_task": None},
+        )
+
+        flat = {"id": "1", "name": "flat"}
+        self.assertIs(db.unflatten_dict(flat), flat)
+
+    def test_unflatten_rows_matches_unflatten_dict(self):
+        """Test that unflattening a whole result matches unflattening each row."""
+        rows = [
+            {"id": "1", "agent.id": "2", "agent.model.id": None},
+            {"id": "3", "agent.id": None, "agent.model.id": None},
+        ]
+
+        self.assertEqual(
+            list(db.unflatten_rows(rows)), [db.unflatten_dict(row) for row in rows]
+        )
+        self.assertEqual(list(db.unflatten_rows([])), [])
+
+    def test_parse_reuses_frozen_models_for_identical_rows(self):
+        """Test that identical rows of a frozen model share one instance."""
+
+        class Status(BaseModel):
+            model_config = ConfigDict(frozen=True)
+
+            code: str
+            tags: Optional[List[str]] = None
+
+        row = {"code": "new"}
+        first = db.parse_query_to_pydantic(row, Status)
+        self.assertIs(db.parse_query_to_pydantic(dict(row), Status), first)
+
+        # Mutable models are never shared
+        data = {"id": "1", "name": "m"}
+        self.assertIsNot(
+            db.parse_query_to_pydantic(data, Model),
+            db.parse_query_to_pydantic(data, Model),
+        )
+
+        # Unhashable values fall back to a fresh parse
+        tagged = {"code": "new", "tags": ["a"]}
+        self.assertEqual(db.parse_query_to_pydantic(tagged, Status).tags, ["a"])
+
+        # Equal values of different types are not mixed up
+        class Value(BaseModel):
+            model_config = ConfigDict(frozen=True)
+
+            v: Any
+
+        values = [db.parse_query_to_pydantic({"v": v}, Value).v for v in (1, True, 1.0)]
+        self.assertEqual([type(v) for v in values], [int, bool, float])
+
+    def test_model_constructor_builds_nested_models(self):
+        """Test that trusted rows are constructed into nested models without validation."""
+        construct = db.model_constructor(Task)
+        row = {
+            "id": "1",
+            "title": "t",
+            "status": TaskStatus.NEW,
+            "agent.id": "2",
+            "agent.name": "a",
+            "agent.type": AgentType.GENERALIST,
+            "parent_task.id": None,
+            "parent_task.title": None,
+        }
+
+        task = construct(db.unflatten_dict(row))
+        self.assertIsInstance(task.agent, Agent)
+        self.assertEqual(task.agent.name, "a")
+        self.assertIsNone(task.parent_task)
+
+        parent = construct({"id": "1", "parent_task": {"id": "0", "title": "p"}})
+        self.assertIsInstance(parent.parent_task, Task)
+
+    def test_model_constructor_accepts_read_only_rows(self):
+        """Test that a flat RowMapping holding a nested model as JSON is not written to."""
+        engine = sqlalchemy.create_engine("sqlite://")
+        query = sqlalchemy.text(
+            "SELECT '1' AS id, 't' AS title, 'new' AS status, "
+            """'{"id": "2", "name": "a", "type": "generalist"}' AS agent"""
+        ).columns(agent=sqlalchemy.JSON)
+        with engine.connect() as conn:
+            row = conn.execute(query).mappings().one()
+        engine.dispose()
+
+        task = db.model_constructor(Task)(db.unflatten_dict(row))
+        self.assertIsInstance(task.agent, Agent)
+        self.assertEqual(task.agent.name, "a")
+        self.assertIsInstance(row["agent"], dict)
+
     def test_parse_empty_data(self):
         """Test parsing with empty data returns None."""
         # Test with None
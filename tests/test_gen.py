@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+
+from foundation_sql.gen import SQLGenerator
+
+
+class TestSQLGeneratorPromptCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.generator = SQLGenerator("key", "http://llm", prompt_cache_size=2)
+        patcher = mock.patch.object(
+            self.generator,
+            "_generate",
+            side_effect=lambda m: f"SELECT '{m[-1]['content']}'",
+        )
+        self.llm = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_prompt_skips_llm(self):
+        self.assertEqual(self.generator.generate_sql("a"), "SELECT 'a'")
+        self.assertEqual(self.generator.generate_sql("a"), "SELECT 'a'")
+        self.assertEqual(self.llm.call_count, 1)
+        self.assertEqual(
+            (self.generator.cache_hits, self.generator.cache_misses), (1, 1)
+        )
+
+    def test_use_cache_false_regenerates(self):
+        self.generator.generate_sql("a")
+        self.generator.generate_sql("a", use_cache=False)
+        self.assertEqual(self.llm.call_count, 2)
+
+    def test_least_recently_used_prompt_evicted(self):
+        for prompt in ("a", "b", "a", "c", "a", "b"):
+            self.generator.generate_sql(prompt)
+        # "b" was evicted by "c"; "a" stayed in use
+        self.assertEqual(
+            [c.args[0][-1]["content"] for c in self.llm.call_args_list],
+            ["a", "b", "c", "b"],
+        )
+
+    def test_batch_keeps_prompt_order(self):
+        self.assertEqual(
+            self.generator.generate_sql_batch(["a", "b", "c"], max_workers=3),
+            ["SELECT 'a'", "SELECT 'b'", "SELECT 'c'"],
+        )
+
+
+class TestSharedSQLGenerator(unittest.TestCase):
+    def test_shared_per_settings(self):
+        shared = SQLGenerator.shared(api_key="key", base_url="http://llm", model="m")
+        self.assertIs(
+            shared, SQLGenerator.shared(model="m", base_url="http://llm", api_key="key")
+        )
+        self.assertIsNot(
+            shared, SQLGenerator.shared(api_key="key", base_url="http://llm", model="n")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
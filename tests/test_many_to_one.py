@@ -1,5 +1,3 @@
-import os
-import shutil
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -44,24 +42,22 @@ class TestWorkspaceTasks(common.DatabaseTests):
 
     @classmethod
     def setUpClass(cls) -> None:
-        # Ensure clean cache dir and seed SQLite-friendly templates
-        if os.path.exists(CACHE_DIR):
-            shutil.rmtree(CACHE_DIR)
-        os.makedirs(CACHE_DIR, exist_ok=True)
-
+        # Seed SQLite-friendly templates
         # Create workspace: insert then fetch by last_insert_rowid()
-        with open(os.path.join(CACHE_DIR, "create_workspace.sql"), "w") as f:
-            f.write(
-                """
+        common.write_template(
+            CACHE_DIR,
+            "create_workspace.sql",
+            """
                 INSERT INTO workspaces (name) VALUES ({{ name | tojson }});
                 SELECT id, name FROM workspaces WHERE id = last_insert_rowid();
-                """.strip()
-            )
+                """.strip(),
+        )
 
         # Add task to workspace: insert then fetch row
-        with open(os.path.join(CACHE_DIR, "add_task_to_workspace.sql"), "w") as f:
-            f.write(
-                """
+        common.write_template(
+            CACHE_DIR,
+            "add_task_to_workspace.sql",
+            """
                 INSERT INTO tasks (workspace_id, title, description)
                 VALUES (
                     {{ workspace.id }},
@@ -75,13 +71,14 @@ class TestWorkspaceTasks(common.DatabaseTests):
                     description as "description"
                 FROM tasks 
                 WHERE id = last_insert_rowid();
-                """.strip()
-            )
+                """.strip(),
+        )
 
         # Get tasks for workspace: join with dotted aliases for nesting
-        with open(os.path.join(CACHE_DIR, "get_tasks_for_workspace.sql"), "w") as f:
-            f.write(
-                """
+        common.write_template(
+            CACHE_DIR,
+            "get_tasks_for_workspace.sql",
+            """
                 SELECT 
                     t.id as "id",
                     t.workspace_id as "workspace.id",
@@ -92,8 +89,8 @@ class TestWorkspaceTasks(common.DatabaseTests):
                 JOIN workspaces w ON w.id = t.workspace_id
                 WHERE w.id = {{ workspace.id }}
                 ORDER BY t.id;
-                """.strip()
-            )
+                """.strip(),
+        )
 
 
 @query
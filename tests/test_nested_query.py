@@ -1,5 +1,3 @@
-import os
-import shutil
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -51,15 +49,12 @@ class TestNestedQuery(common.DatabaseTests):
 
     @classmethod
     def setUpClass(cls) -> None:
-        # Ensure clean cache dir and seed SQLite/Postgres portable templates
-        if os.path.exists(CACHE_DIR):
-            shutil.rmtree(CACHE_DIR)
-        os.makedirs(CACHE_DIR, exist_ok=True)
-
+        # Seed SQLite/Postgres portable templates
         # Portable SELECT using dotted aliases so our unflatten logic can build nested objects
-        with open(os.path.join(CACHE_DIR, "get_users_with_profile.sql"), "w") as f:
-            f.write(
-                """
+        common.write_template(
+            CACHE_DIR,
+            "get_users_with_profile.sql",
+            """
                 SELECT 
                     u.id as "id",
                     u.name as "name",
@@ -71,13 +66,14 @@ class TestNestedQuery(common.DatabaseTests):
                     u.address_zip_code as "profile.address.zip_code"
                 FROM users_with_profile u
                 ORDER BY u.id;
-                """.strip()
-            )
+                """.strip(),
+        )
 
         # Portable INSERT template using jinja2 variables (handled by jinja2sql)
-        with open(os.path.join(CACHE_DIR, "create_user_with_profile.sql"), "w") as f:
-            f.write(
-                """
+        common.write_template(
+            CACHE_DIR,
+            "create_user_with_profile.sql",
+            """
                 INSERT INTO users_with_profile (
                     id, name, email, role, profile_bio, address_street, address_city, address_zip_code
                 ) VALUES (
@@ -90,8 +86,8 @@ class TestNestedQuery(common.DatabaseTests):
                     {{ user.profile.address.city | default(None) | tojson }},
                     {{ user.profile.address.zip_code | default(None) | tojson }}
                 );
-                """.strip()
-            )
+                """.strip(),
+        )
 
 
 @query
@@ -166,7 +162,7 @@ def create_user_with_profile(user: UserWithProfile) -> int:
         self.assertEqual(len(retrieved_users), 1)
 
         # Find the newly added user
-        retrieved_user = next(u for u in retrieved_users if u.id == "nested_user_2")
+        retrieved_user = {u.id: u for u in retrieved_users}["nested_user_2"]
 
         self.assertEqual(retrieved_user.id, "nested_user_2")
         self.assertEqual(retrieved_user.name, "John Smith")
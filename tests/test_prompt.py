@@ -0,0 +1,74 @@
+import json
+import unittest
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from foundation_sql.prompt import FunctionSpec, SQLPromptGenerator
+
+
+class Address(BaseModel):
+    city: str
+    zip: Optional[str] = None
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    address: Optional[Address] = None
+
+
+def get_users(name: str, user: User, limit: int = 5) -> List[User]:
+    """Gets users by name."""
+
+
+class TestSQLPromptGenerator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.generator = SQLPromptGenerator(
+            FunctionSpec.get(get_users), "get_users.sql", "SYSTEM", "SCHEMA"
+        )
+
+    def test_prompt_contains_function_context(self):
+        prompt = self.generator.generate_prompt(
+            {"name": "x", "user": User(id=1, name="a", address=Address(city="c"))}
+        )
+
+        self.assertTrue(prompt.startswith("\nSYSTEM\n"))
+        self.assertIn("Available Tables Schema:\nSCHEMA\n", prompt)
+        self.assertIn("Function Name: get_users\n", prompt)
+        self.assertIn("limit: int = 5", prompt)
+        self.assertIn("Function Docstring: Gets users by name.\n", prompt)
+        self.assertIn('"address": {\n      "city": "c"\n    }', prompt)
+        self.assertIn("Return model: User\n", prompt)
+        self.assertNotIn("following error", prompt)
+
+    def test_prompt_includes_error_feedback(self):
+        prompt = self.generator.generate_prompt({}, "no such table", "SELECT 1")
+
+        self.assertIn("generated the following SQL:\nSELECT 1\n", prompt)
+        self.assertIn("following error was encountered:\nno such table\n", prompt)
+        self.assertTrue(prompt.endswith("template that works.\n\n"))
+
+    def test_messages_keep_shared_context_in_system_message(self):
+        messages = self.generator.generate_messages({"name": "x"})
+
+        self.assertEqual([m["role"] for m in messages], ["system", "user"])
+        self.assertIn("SYSTEM", messages[0]["content"])
+        self.assertIn("SCHEMA", messages[0]["content"])
+        self.assertNotIn("get_users", messages[0]["content"])
+        self.assertTrue(messages[1]["content"].startswith("Function Name: get_users"))
+        self.assertEqual(
+            "".join(m["content"] for m in messages),
+            self.generator.generate_prompt({"name": "x"}),
+        )
+
+    def test_kwargs_json_matches_json_dumps(self):
+        kwargs = {"name": "Zoë", "limit": 2**70}
+        self.assertEqual(
+            FunctionSpec.get(get_users).kwargs_json(kwargs),
+            json.dumps(kwargs, indent=2),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
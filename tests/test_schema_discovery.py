@@ -1,9 +1,11 @@
+import contextlib
 import os
 import sqlite3
 from typing import List
 
 from pydantic import BaseModel
 
+from foundation_sql import db
 from tests import common
 
 # --- Start of moved code from tests/utils.py ---
@@ -16,22 +18,20 @@ BIKES_DB_PATH = os.path.abspath(
 def create_bike_db():
     os.makedirs(os.path.dirname(BIKES_DB_PATH), exist_ok=True)
 
-    if os.path.exists(BIKES_DB_PATH):
-        os.remove(BIKES_DB_PATH)
-
-    conn = sqlite3.connect(BIKES_DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
+    # Reset the table in the existing file instead of deleting and recreating it;
+    # executescript runs the whole script in one call. WAL mode is stored in the
+    # file, so the engine's connections use it too: commits append to the log
+    # instead of rewriting the database and its rollback journal
+    with contextlib.closing(sqlite3.connect(BIKES_DB_PATH)) as conn:
+        conn.executescript("""
+    PRAGMA journal_mode=WAL;
+    DROP TABLE IF EXISTS bikes;
     CREATE TABLE bikes (
         make TEXT NOT NULL,
         model TEXT NOT NULL,
         price INTEGER NOT NULL
     );
-    """
-    )
-    conn.commit()
-    conn.close()
+    """)
 
 
 # --- End of moved code ---
@@ -76,14 +76,14 @@ class TestSchemaDiscovery(common.DatabaseTests):
     db_url = f"sqlite:///{BIKES_DB_PATH}"
     schema_sql = None
 
-    def test_schema_discovery(self):
-
-        re_bike = Bike(make="RE", model="Classic", price=600)
-        create_bike(bike=re_bike)
-
-        harley_bike = Bike(make="Harley", model="A very good one", price=500)
-        create_bike(bike=harley_bike)
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Seed once per class, committing both inserts together
+        with db.get_db(cls.db_url).transaction():
+            create_bike(bike=Bike(make="RE", model="Classic", price=600))
+            create_bike(bike=Bike(make="Harley", model="A very good one", price=500))
 
+    def test_schema_discovery(self):
         bikes = get_bikes()
         self.assertEqual(len(bikes), 2)
 
@@ -1,5 +1,3 @@
-import os
-import shutil
 from typing import List
 
 from pydantic import BaseModel
@@ -25,6 +23,24 @@ CREATE TABLE IF NOT EXISTS users (
 )
 """
 
+# Deterministic SELECT mapping to Pydantic model fields
+GET_USERS_SQL = """SELECT
+    id as "id",
+    name as "name",
+    email as "email",
+    role as "role"
+FROM users
+ORDER BY id;"""
+
+# Deterministic INSERT using provided user fields (string id in this schema)
+CREATE_USER_SQL = """INSERT INTO users (id, name, email, role)
+VALUES (
+    {{ user.id }},
+    {{ user.name | tojson }},
+    {{ user.email | tojson }},
+    {{ user.role | tojson }}
+);"""
+
 query = common.create_query(schema=TABLES_SCHEMA)
 
 
@@ -51,42 +67,9 @@ class TestQuery(common.DatabaseTests):
 
     @classmethod
     def setUpClass(cls) -> None:
-        # Ensure clean cache dir and seed SQLite-friendly templates for this test
-        if os.path.exists(cls.CACHE_DIR):
-            shutil.rmtree(cls.CACHE_DIR)
-        os.makedirs(cls.CACHE_DIR, exist_ok=True)
-
-        # Deterministic SELECT mapping to Pydantic model fields
-        with open(os.path.join(cls.CACHE_DIR, "get_users.sql"), "w") as f:
-            f.write(
-                (
-                    """
-                    SELECT 
-                        id as "id",
-                        name as "name",
-                        email as "email",
-                        role as "role"
-                    FROM users
-                    ORDER BY id;
-                    """
-                ).strip()
-            )
-
-        # Deterministic INSERT using provided user fields (string id in this schema)
-        with open(os.path.join(cls.CACHE_DIR, "create_user.sql"), "w") as f:
-            f.write(
-                (
-                    """
-                    INSERT INTO users (id, name, email, role)
-                    VALUES (
-                        {{ user.id }},
-                        {{ user.name | tojson }},
-                        {{ user.email | tojson }},
-                        {{ user.role | tojson }}
-                    );
-                    """
-                ).strip()
-            )
+        # Seed SQLite-friendly templates for this test
+        common.write_template(cls.CACHE_DIR, "get_users.sql", GET_USERS_SQL)
+        common.write_template(cls.CACHE_DIR, "create_user.sql", CREATE_USER_SQL)
 
     def test_users(self):
         users = get_users()